@@ -12,6 +12,10 @@ setup(
         "numpy>=1.20.0",
         "openpyxl>=3.0.0",
     ],
+    extras_require={
+        "calamine": ["python-calamine"],
+        "xlsxwriter": ["xlsxwriter"],
+    },
     python_requires=">=3.7",
     classifiers=[
         "Development Status :: 3 - Alpha",
@@ -1,7 +1,9 @@
 import unittest
+import numpy as np
 import pandas as pd
 
 from xlgrab.core import XlDataFrame
+from xlgrab.data.header import apply_header
 
 
 class TestApplyHeader(unittest.TestCase):
@@ -66,6 +68,46 @@ class TestApplyHeader(unittest.TestCase):
         out = self.df.apply_header(['x', 'x', 'x', ])
         self.assertEqual(out.columns.tolist(), ['x', 'x_1', 'x_2'])
 
+    def test_not_inplace_does_not_share_data(self):
+        # inplace=False 的返回值修改后，原表不受影响（无论是否开启 Copy-on-Write）
+        for header in (False, 0, [0, 1]):
+            raw = pd.DataFrame({'A': ['H1', 'H2', 1.0, 2.0], 'B': ['C1', 'C2', 3.0, 4.0]})
+            out = apply_header(raw, header, inplace=False)
+            out.iloc[-1, 0] = 'changed'
+            self.assertEqual(raw.iloc[-1, 0], 2.0)
+
+    def test_multi_row_header_with_missing_cells(self):
+        # header=[0,1]：多行表头按分隔符合并，缺失部分跳过
+        raw = pd.DataFrame([['a', 'b', np.nan], ['x', np.nan, 'z'], ['p', 'q', 'r'], [1, 2, 3]],
+                           columns=['A', 'B', 'C'])
+        out = apply_header(raw, [0, 1], inplace=False)
+        self.assertEqual(out.columns.tolist(), ['a_x', 'b', 'z'])
+        self.assertEqual(out.values.tolist(), [['p', 'q', 'r'], [1, 2, 3]])
+        self.assertEqual(out.index.tolist(), [0, 1])
+
+    def test_non_contiguous_header_rows(self):
+        # header=[0,2]：不连续的表头行，数据从最后一个表头行之后开始
+        raw = pd.DataFrame([['a', 'b', np.nan], ['x', np.nan, 'z'], ['p', 'q', 'r'], [1, 2, 3]],
+                           columns=['A', 'B', 'C'])
+        out = apply_header(raw, [0, 2], inplace=False)
+        self.assertEqual(out.columns.tolist(), ['a_p', 'b_q', 'r'])
+        self.assertEqual(out.values.tolist(), [[1, 2, 3]])
+
+    def test_missing_single_header_cell(self):
+        # 单行表头含 NaN：生成 _N 占位列名，而不是 '<NA>' 或 'nan'
+        raw = pd.DataFrame([['a', 'b', np.nan], ['x', np.nan, 'z'], [1, 2, 3]], columns=['A', 'B', 'C'])
+        out = apply_header(raw, 0, inplace=False)
+        self.assertEqual(out.columns.tolist(), ['a', 'b', '_1'])
+        self.assertIsNone(apply_header(raw, 1))
+        self.assertEqual(raw.columns.tolist(), ['x', '_1', 'z'])
+        self.assertEqual(len(raw), 1)
+
+    def test_inplace_replaces_frame(self):
+        raw = pd.DataFrame({'A': ['H1', 'r1', 'r2'], 'B': ['C1', 1, 2]})
+        self.assertIsNone(apply_header(raw, 0, inplace=True))
+        self.assertEqual(raw.columns.tolist(), ['H1', 'C1'])
+        self.assertEqual(raw['C1'].tolist(), [1, 2])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,166 @@
+import os
+import re
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+import openpyxl
+from openpyxl.styles import Border, Font, PatternFill, Side
+from openpyxl.worksheet.formula import ArrayFormula
+
+from xlgrab.excel import merger, writer
+
+
+class TestUnmergeCopyStyle(unittest.TestCase):
+
+    def setUp(self):
+        wb = openpyxl.Workbook()
+        self.ws = wb.active
+        self.ws['B2'] = 0.25
+        self.ws['B2'].number_format = '0.0%'
+        self.ws['B2'].font = Font(bold=True)
+        self.ws['B2'].border = Border(left=Side(style='thin'))
+        self.ws.merge_cells('B2:C3')
+
+    def test_default_copies_number_format_only(self):
+        # 默认只复制数字格式与数据类型，字体、边框等不扩散到原合并区域内
+        merger.unmerge_sheet(self.ws)
+        cell = self.ws['C3']
+        self.assertEqual([cell.value, cell.data_type, cell.number_format], [0.25, 'n', '0.0%'])
+        self.assertFalse(cell.font.b)
+        self.assertIsNone(cell.border.left.style)
+
+    def test_copy_style_all(self):
+        merger.unmerge_sheet(self.ws, copy_style='all')
+        cell = self.ws['C3']
+        self.assertEqual([cell.value, cell.number_format, cell.font.b, cell.border.left.style],
+                         [0.25, '0.0%', True, 'thin'])
+
+    def test_copy_style_false(self):
+        merger.unmerge_sheet(self.ws, copy_style=False)
+        cell = self.ws['C3']
+        self.assertEqual([cell.value, cell.number_format], [0.25, 'General'])
+
+
+@unittest.skipUnless(merger.LXML_AVAILABLE, "需要安装 lxml")
+class TestUnmergeFastPath(unittest.TestCase):
+    """fast=True（直接改写 XML）与 copy_style='all' 的 openpyxl 路径拆分结果一致"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src = os.path.join(self.tmp.name, 'src.xlsx')
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = 'S1'
+        ws['A1'] = '标题'
+        ws['A1'].font = Font(bold=True)
+        ws['A1'].fill = PatternFill('solid', fgColor='FFFF0000')
+        ws.merge_cells('A1:C1')
+        ws['A2'] = 1234.5
+        ws['A2'].number_format = '#,##0.00'
+        ws.merge_cells('A2:A4')
+        ws['B2'] = '=SUM(A10:A12)'
+        ws.merge_cells('B2:C3')
+        for r in range(1, 4):
+            ws.cell(r, 5, f'=A{r + 9}*2')
+        ws.merge_cells('E2:F2')
+        for r in range(10, 13):
+            ws.cell(r, 1, r)
+        ws['A21'] = 'x'
+        ws['A21'].font = Font(italic=True)
+        ws.merge_cells('A21:B23')
+        ws.merge_cells('D25:E26')
+        ws['G1'] = ArrayFormula('G1', '=SUM(A10:A12*2)')
+        ws.merge_cells('G1:H2')
+        ws2 = wb.create_sheet('S2')
+        ws2['B2'] = 'second'
+        ws2['B2'].fill = PatternFill('solid', fgColor='FF00FF00')
+        ws2.merge_cells('B2:D4')
+        wb.save(self.src)
+        self.rewrite_sheet1()
+
+    def rewrite_sheet1(self):
+        # E1:E3 改为共享公式；删除合并区域内不存在值的行，使 <row> 需要新建
+        name = 'xl/worksheets/sheet1.xml'
+        with zipfile.ZipFile(self.src) as zin:
+            parts = {info.filename: zin.read(info.filename) for info in zin.infolist()}
+        xml = parts[name].decode('utf-8')
+        xml = xml.replace('<f>A10*2</f>', '<f t="shared" ref="E1:E3" si="0">A10*2</f>')
+        xml = xml.replace('<f>A11*2</f>', '<f t="shared" si="0"/>')
+        xml = xml.replace('<f>A12*2</f>', '<f t="shared" si="0"/>')
+        xml = re.sub(r'<row r="(22|23|25|26)"[^>]*?(/>|>.*?</row>)', '', xml)
+        self.assertIn('t="shared"', xml)
+        self.assertNotIn('<row r="22"', xml)
+        parts[name] = xml.encode('utf-8')
+        with zipfile.ZipFile(self.src, 'w', zipfile.ZIP_DEFLATED) as zout:
+            for filename, data in parts.items():
+                zout.writestr(filename, data)
+
+    def unmerge(self, fast, **kwargs):
+        path = os.path.join(self.tmp.name, f'fast_{fast}.xlsx')
+        shutil.copy(self.src, path)
+        merger.unmerge_excel(path, fast=fast, **kwargs)
+        return openpyxl.load_workbook(path)
+
+    def snapshot(self, ws):
+        def value(c):
+            if isinstance(c.value, ArrayFormula):
+                return ('array', c.value.ref, c.value.text)
+            return c.value
+        return {
+            c.coordinate: (value(c), c.data_type, c.number_format, c.font.b, c.font.i, c.fill.fgColor.rgb)
+            for row in ws.iter_rows(min_row=1, max_row=30, max_col=8) for c in row
+        }
+
+    def test_matches_openpyxl_path(self):
+        slow = self.unmerge(fast=False, copy_style='all')
+        fast = self.unmerge(fast=True)
+        self.assertEqual(fast.sheetnames, slow.sheetnames)
+        for name in slow.sheetnames:
+            with self.subTest(sheet=name):
+                self.assertFalse(fast[name].merged_cells.ranges)
+                self.assertEqual(self.snapshot(fast[name]), self.snapshot(slow[name]))
+
+        ws = fast['S1']
+        self.assertEqual([ws['A4'].value, ws['A4'].number_format], [1234.5, '#,##0.00'])
+        self.assertEqual(ws['C3'].value, '=SUM(A10:A12)')
+        # 合并区域左上角为共享公式的从属单元格时，复制平移后的公式
+        self.assertEqual([ws['E2'].value, ws['F2'].value, ws['E3'].value], ['=A11*2', '=A11*2', '=A12*2'])
+        self.assertEqual([ws['B23'].value, ws['B23'].font.i], ['x', True])
+        self.assertEqual(fast['S2']['D4'].value, 'second')
+
+    def test_array_formula_refs_do_not_overlap(self):
+        # 数组公式复制后各自的 ref 只覆盖所在单元格，不会与源单元格的数组区域重叠（否则 Excel 报文件损坏）
+        for fast in (False, True):
+            ws = self.unmerge(fast=fast, copy_style='all')['S1']
+            with self.subTest(fast=fast):
+                for coord in ('G1', 'H1', 'G2', 'H2'):
+                    self.assertIsInstance(ws[coord].value, ArrayFormula)
+                    self.assertEqual((ws[coord].value.ref, ws[coord].value.text), (coord, '=SUM(A10:A12*2)'))
+
+    @unittest.skipIf(os.name == 'nt', "Windows 不支持 POSIX 权限位")
+    def test_keeps_file_mode(self):
+        path = os.path.join(self.tmp.name, 'mode.xlsx')
+        shutil.copy(self.src, path)
+        os.chmod(path, 0o640)
+        merger.unmerge_excel(path, fast=True)
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+        output = os.path.join(self.tmp.name, 'new.xlsx')
+        merger.unmerge_excel(self.src, output_path=output, fast=True)
+        self.assertEqual(os.stat(output).st_mode & 0o777, writer._NEW_FILE_MODE)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['mode.xlsx', 'new.xlsx', 'src.xlsx'])
+
+    def test_sheet_names_subset(self):
+        slow = self.unmerge(fast=False, copy_style='all', sheet_names='S2')
+        fast = self.unmerge(fast=True, sheet_names='S2')
+        self.assertEqual(len(fast['S1'].merged_cells.ranges), len(slow['S1'].merged_cells.ranges))
+        self.assertFalse(fast['S2'].merged_cells.ranges)
+        for name in slow.sheetnames:
+            with self.subTest(sheet=name):
+                self.assertEqual(self.snapshot(fast[name]), self.snapshot(slow[name]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import itertools
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import openpyxl
+from openpyxl.styles import Font
+import pandas as pd
+
+from xlgrab.excel import reader
+
+
+def _calamine_available():
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return False
+    return 'calamine' in getattr(pd.ExcelFile, '_engines', {})
+
+
+class TestReadExcelRange(unittest.TestCase):
+
+    RANGES = ['A1:C4', 'B2:D6', 'C5:E9', 'A8:B12', 'D1:D3']
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(reader._sheet_cache.clear)
+        reader._sheet_cache.clear()
+        self.path = os.path.join(self.tmp.name, 'data.xlsx')
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = 'Data'
+        ws.append(['name', 'qty', 'price', None, 'note'])
+        ws.append(['a', 1, 1.5, None, None])
+        ws.append(['b', 2, None, 'x', 'y'])
+        ws.append([None, None, None, None, None])
+        ws.append(['c', 3, 3.5, None, 'z'])
+        ws.append(['d', 4, 4.5])
+        # 第 7 行起为空行，测试末尾空行的裁剪
+        wb.save(self.path)
+
+    def expected(self, cell_range, engine):
+        min_col, min_row, max_col, max_row = openpyxl.utils.range_boundaries(cell_range)
+        return pd.read_excel(
+            self.path, sheet_name='Data', header=None, engine=engine,
+            usecols=list(range(min_col - 1, max_col)),
+            skiprows=min_row - 1, nrows=max_row - min_row + 1,
+        )
+
+    def check_engine(self, engine):
+        result = reader.read_excel_range(self.path, sheet_name='Data', ranges=self.RANGES, engine=engine)
+        for cell_range in self.RANGES:
+            with self.subTest(engine=engine, range=cell_range):
+                pd.testing.assert_frame_equal(result[cell_range], self.expected(cell_range, engine))
+
+    def test_openpyxl_engine(self):
+        with mock.patch.object(reader, '_load_sheet_rows', wraps=reader._load_sheet_rows) as load:
+            self.check_engine('openpyxl')
+        # 本地文件走按行缓存的快速路径
+        self.assertEqual(load.call_count, 1)
+
+    @unittest.skipUnless(_calamine_available(), "需要安装 python-calamine")
+    def test_calamine_engine(self):
+        self.check_engine('calamine')
+
+    def test_fallback_without_sheet_reader(self):
+        # pandas 内部读取器不提供所需接口时改用 ExcelFile.parse，结果不变
+        with mock.patch.object(reader, '_sheet_reader_supported', return_value=False), \
+                mock.patch.object(reader, '_load_sheet_rows', side_effect=AssertionError) as load:
+            self.check_engine('openpyxl')
+        load.assert_not_called()
+
+    def test_sheet_name_none_or_list(self):
+        # sheet_name=None / 列表时与 read_excel 一致返回 {工作表: DataFrame}，不走按行缓存
+        with mock.patch.object(reader, '_load_sheet_rows', side_effect=AssertionError) as load:
+            result = reader.read_excel_range(self.path, sheet_name=None, ranges='A1:C4')
+            self.assertEqual(list(result), ['Data'])
+            pd.testing.assert_frame_equal(result['Data'], self.expected('A1:C4', 'openpyxl'))
+            result = reader.read_excel_range(self.path, sheet_name=['Data'], ranges=['A1:C4', 'B2:D6'])
+            for cell_range in ('A1:C4', 'B2:D6'):
+                pd.testing.assert_frame_equal(result[cell_range]['Data'], self.expected(cell_range, 'openpyxl'))
+        load.assert_not_called()
+
+    def test_sheet_reader_supported(self):
+        self.assertTrue(reader._sheet_reader_supported('openpyxl'))
+        self.assertFalse(reader._sheet_reader_supported('no-such-engine'))
+
+
+class TestSliceSheetRows(unittest.TestCase):
+    """按行缓存切片（_slice_sheet_rows）与 pd.read_excel(usecols, skiprows, nrows) 的结果一致"""
+
+    ENGINES = ['openpyxl'] + (['calamine'] if _calamine_available() else [])
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(reader._sheet_cache.clear)
+        reader._sheet_cache.clear()
+        self.path = os.path.join(self.tmp.name, 'rows.xlsx')
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = 'S'
+        ws.append(['h1', 'h2', 'h3', 'h4'])
+        ws.append([1, 'a', None, 2.5])
+        ws.append([None, None, None, None])
+        ws.append([3, None, 'c'])
+        ws.append([None, 'b'])
+        # 之后只有格式没有值的行（末尾空行），以及更靠下的一个孤立值
+        for r in range(6, 9):
+            ws.cell(r, 2).font = Font(bold=True)
+        ws.cell(12, 3, 'tail')
+        for r in range(13, 16):
+            ws.cell(r, 1).font = Font(italic=True)
+        wb.save(self.path)
+
+    def ranges(self):
+        bounds = [1, 2, 3, 5, 6, 8, 11, 12, 15, 20]
+        for r1, r2 in itertools.combinations_with_replacement(bounds, 2):
+            for c1, c2 in ((1, 1), (1, 4), (2, 3), (3, 5), (5, 6)):
+                yield r1, r2, c1, c2
+
+    def expected(self, engine, r1, r2, c1, c2, **kwargs):
+        try:
+            return pd.read_excel(self.path, sheet_name='S', engine=engine,
+                                 usecols=list(range(c1 - 1, c2)), skiprows=r1 - 1, nrows=r2 - r1 + 1,
+                                 **kwargs)
+        except Exception as e:
+            return type(e)
+
+    def actual(self, engine, r1, r2, c1, c2, **kwargs):
+        cell_range = f"{openpyxl.utils.get_column_letter(c1)}{r1}:{openpyxl.utils.get_column_letter(c2)}{r2}"
+        try:
+            return reader.read_excel_range(self.path, sheet_name='S', ranges=cell_range, engine=engine, **kwargs)
+        except ValueError as e:
+            return type(e.__cause__ or e.__context__ or e)
+
+    def assert_same(self, got, exp):
+        if isinstance(exp, type) or isinstance(got, type):
+            # read_excel 报错时 read_excel_range 也应报错（包装为 ValueError）
+            self.assertEqual(isinstance(got, type), isinstance(exp, type))
+        else:
+            pd.testing.assert_frame_equal(got, exp)
+
+    def test_header_none_matches_read_excel(self):
+        for engine in self.ENGINES:
+            for r1, r2, c1, c2 in self.ranges():
+                with self.subTest(engine=engine, range=(r1, r2, c1, c2)):
+                    self.assert_same(self.actual(engine, r1, r2, c1, c2),
+                                     self.expected(engine, r1, r2, c1, c2, header=None))
+
+    def test_header_int_matches_read_excel(self):
+        # 传入 header 等解析参数时不走行缓存，与 read_excel 同参数调用一致
+        for engine in self.ENGINES:
+            for (r1, r2, c1, c2), header in itertools.product(
+                    [(1, 5, 1, 4), (2, 8, 2, 3), (4, 12, 1, 3)], [0, 1]):
+                with self.subTest(engine=engine, range=(r1, r2, c1, c2), header=header):
+                    self.assert_same(self.actual(engine, r1, r2, c1, c2, header=header),
+                                     self.expected(engine, r1, r2, c1, c2, header=header))
+
+    def test_partial_cache_then_lower_range(self):
+        # 先读靠上的范围只缓存部分行，之后读更靠下的范围时改读整表，结果仍一致
+        for engine in self.ENGINES:
+            reader._sheet_cache.clear()
+            for r1, r2, c1, c2 in [(1, 2, 1, 2), (2, 5, 1, 4), (10, 15, 1, 4), (1, 3, 2, 2)]:
+                with self.subTest(engine=engine, range=(r1, r2, c1, c2)):
+                    self.assert_same(self.actual(engine, r1, r2, c1, c2),
+                                     self.expected(engine, r1, r2, c1, c2, header=None))
+
+
+if __name__ == '__main__':
+    unittest.main()
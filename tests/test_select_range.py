@@ -65,6 +65,55 @@ class TestSelectRange(unittest.TestCase):
         self.assertEqual(out.iloc[0,0], 'A2')
         self.assertEqual(out.iloc[-1,-1], 'C4')
 
+    def test_find_row_exact_with_missing_values(self):
+        # 等值查找所在列含 pd.NA/None 时，缺失值按未命中处理
+        df = xlgrab.XlDataFrame({
+            'A': ['x', pd.NA, 'foo', None, 'foo'],
+            'B': [1, 2, 3, 4, 5],
+        })
+        out = df.select_range(
+            start_row=('find-row', 'A', 'foo', {'mode': 'exact', 'nth': 1}),
+            end_row=('find-row', 'A', 'foo', {'mode': 'exact', 'nth': -1}),
+        )
+        self.assertEqual(out['B'].tolist(), [3, 4, 5])
+
+    def test_find_row_exact_repeated_lookups(self):
+        # 同一列上多次等值查找（含数值查询）结果与逐个扫描一致
+        df = xlgrab.XlDataFrame({'A': [10, 20, 30, 20, 10], 'B': list('abcde')})
+        out = df.select_range(
+            start_row=('find-row', 'A', 20, {'mode': 'exact', 'nth': 1}),
+            end_row=('find-row', 'A', 20, {'mode': 'exact', 'nth': -1}),
+        )
+        self.assertEqual(out['B'].tolist(), ['b', 'c', 'd'])
+
+    def test_default_returns_independent_copy(self):
+        # 默认 copy=True：修改结果不影响原表
+        df = pd.DataFrame(np.arange(20.0).reshape(5, 4))
+        out = df.xl.select_range(start='B2', end='C4')
+        out.iloc[0, 0] = -1.0
+        self.assertEqual(df.iloc[1, 1], 5.0)
+        out = df.xl.excel_range('A1:D5', header=False)
+        out.iloc[0, 0] = -1.0
+        self.assertEqual(df.iloc[0, 0], 0.0)
+
+    def test_excel_range_header_copies_once(self):
+        # 去掉表头行后的结果是独立副本，设置索引等后续调整不会改动原表
+        df = pd.DataFrame({'A': ['k', 'x', 'y'], 'B': ['v', 1.0, 2.0]})
+        out = df.xl.excel_range('A1:B3', header=True, index_col=0)
+        self.assertEqual(out.index.tolist(), ['x', 'y'])
+        out.iloc[0, 0] = -1.0
+        self.assertEqual(df.iloc[1, 1], 1.0)
+        self.assertEqual(df.columns.tolist(), ['A', 'B'])
+
+    def test_absolute_cell_references(self):
+        # '$A$2' 等绝对引用与相对引用结果相同
+        expected = self.df.select_range(start='B2', end='C4')
+        for start, end in (('$B$2', '$C$4'), ('B$2', '$C4')):
+            pd.testing.assert_frame_equal(self.df.select_range(start=start, end=end), expected)
+        start, end = ('cell', '$B$2'), ('cell', 'C$4')
+        out = self.df.select_range(start_row=start, start_col=start, end_row=end, end_col=end)
+        pd.testing.assert_frame_equal(out, expected)
+
 
 if __name__ == '__main__':
     unittest.main()
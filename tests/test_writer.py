@@ -0,0 +1,374 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from xlgrab.excel import writer
+
+
+class TestToSheetMany(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_parallel_writes_each_file(self):
+        # parallel=True 时多个文件分发到进程池写入，结果与串行一致
+        df1 = pd.DataFrame({'A': [1, 2]})
+        df2 = pd.DataFrame({'B': ['x', 'y']})
+        tasks = [
+            {'excel_name': self.path('a.xlsx'), 'df': df1, 'sheet_name': 'S1'},
+            {'excel_name': self.path('a.xlsx'), 'df': df2, 'sheet_name': 'S1', 'start_row': 5},
+            {'excel_name': self.path('b.xlsx'), 'df': df2, 'sheet_name': 'S2'},
+        ]
+        writer.to_sheet_many(tasks, parallel=True)
+
+        ws = openpyxl.load_workbook(self.path('a.xlsx'))['S1']
+        self.assertEqual([c.value for c in ws['A'][:3]], ['A', 1, 2])
+        self.assertEqual([c.value for c in ws['A'][4:7]], ['B', 'x', 'y'])
+        ws = openpyxl.load_workbook(self.path('b.xlsx'))['S2']
+        self.assertEqual([c.value for c in ws['A']], ['B', 'x', 'y'])
+
+    def test_coalesce_adjacent_tasks(self):
+        # 首尾相接、无表头、列数一致的连续任务合并为一次写入；其余任务原样保留
+        df = pd.DataFrame({'A': [1, 2], 'B': [3, 4]})
+        tasks = [
+            {'df': df, 'sheet_name': 'S', 'start_row': 1},
+            {'df': df, 'sheet_name': 'S', 'start_row': 4, 'header': False},
+            {'df': df, 'sheet_name': 'S', 'start_row': 6, 'header': False},
+            {'df': df, 'sheet_name': 'S', 'start_row': 9, 'header': False},
+            {'df': df[['A']], 'sheet_name': 'S', 'start_row': 11, 'header': False},
+            {'df': df, 'sheet_name': 'T', 'start_row': 1, 'header': False},
+        ]
+        with mock.patch.object(writer, '_build_write_block', wraps=writer._build_write_block) as build:
+            out = writer._coalesce_tasks(tasks)
+        # 只为合并的 3 个任务构建写入块，单独保留的任务不构建
+        self.assertEqual(build.call_count, 3)
+        self.assertEqual(len(out), 4)
+        self.assertEqual(out[0]['df'].values.tolist(), [['A', 'B'], [1, 3], [2, 4], [1, 3], [2, 4], [1, 3], [2, 4]])
+        self.assertEqual(out[0]['start_row'], 1)
+        self.assertIs(out[1], tasks[3])
+
+        excel_name = self.path('c.xlsx')
+        writer.to_sheet_many([dict(task, excel_name=excel_name) for task in tasks])
+        ws = openpyxl.load_workbook(excel_name)['S']
+        self.assertEqual([c.value for c in ws['A']], ['A', 1, 2, 1, 2, 1, 2, None, 1, 2, 1, 2])
+
+
+class TestWriteOnly(unittest.TestCase):
+    """新文件的 write_only 流式写出与常规 openpyxl 路径结果一致"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(writer.clear_workbook_cache)
+        self.df = pd.DataFrame({'A': [1, 2], 'B': ['x', None]})
+
+    def run_tasks(self, name, tasks, write_only):
+        path = os.path.join(self.tmp.name, name)
+        # write_only=False 时把 _is_append_only 固定为 False，强制走常规路径作为对照
+        patch = contextlib.nullcontext() if write_only else mock.patch.object(writer, '_is_append_only', return_value=False)
+        with patch, mock.patch.object(writer, '_append_block', wraps=writer._append_block) as append:
+            writer.to_sheet_many([dict(task, excel_name=path) for task in tasks])
+        wb = openpyxl.load_workbook(path)
+        cells = {ws.title: [[c.value for c in row] for row in ws.iter_rows()] for ws in wb.worksheets}
+        return cells, append.called
+
+    def check(self, tasks, append_only):
+        self.assertEqual(writer._is_append_only(tasks), append_only)
+        fast, used_write_only = self.run_tasks('fast.xlsx', tasks, write_only=True)
+        slow, _ = self.run_tasks('slow.xlsx', tasks, write_only=False)
+        self.assertEqual(used_write_only, append_only)
+        self.assertEqual(fast, slow)
+        return fast
+
+    def test_int_sheet_names(self):
+        # 整数 sheet_name 按 _get_or_create_worksheet 的规则解析为 Sheet1、Sheet2
+        tasks = [
+            {'df': self.df, 'sheet_name': 0},
+            {'df': self.df, 'sheet_name': 1, 'start_col': 3},
+            {'df': self.df, 'sheet_name': 0, 'start_row': 5, 'header': False},
+        ]
+        cells = self.check(tasks, append_only=True)
+        self.assertEqual(list(cells), ['Sheet1', 'Sheet2'])
+
+    def test_non_increasing_rows_fall_back(self):
+        # 行号不递增或与前一任务重叠时不能顺序追加，改走常规路径
+        self.check([
+            {'df': self.df, 'sheet_name': 'S', 'start_row': 5},
+            {'df': self.df, 'sheet_name': 'S', 'start_row': 1},
+        ], append_only=False)
+        self.check([
+            {'df': self.df, 'sheet_name': 'S', 'start_row': 1},
+            {'df': self.df, 'sheet_name': 'S', 'start_row': 3, 'header': False},
+        ], append_only=False)
+
+    def test_header_false(self):
+        # header=False 时任务只占数据行，紧接上一任务末行之后即可顺序追加
+        tasks = [
+            {'df': self.df, 'sheet_name': 'S', 'header': False, 'start_col': 2},
+            {'df': self.df, 'sheet_name': 'S', 'start_row': 3, 'header': False},
+            {'df': self.df, 'sheet_name': 'T', 'start_row': 2, 'header': False, 'index': True},
+        ]
+        cells = self.check(tasks, append_only=True)
+        self.assertEqual([row[:2] for row in cells['S']], [[None, 1], [None, 2], [1, 'x'], [2, None]])
+
+
+class TestExcelWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(writer.clear_workbook_cache)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_each_file_saved_once(self):
+        # 两个文件交替多次写入：with 块内不保存，退出时每个文件各保存一次
+        a, b = self.path('a.xlsx'), self.path('b.xlsx')
+        writer.write_to_excel(pd.DataFrame({'old': [0]}), b, sheet_name='S')
+        df = pd.DataFrame({'A': [1, 2]})
+        with mock.patch.object(writer, '_atomic_save', wraps=writer._atomic_save) as save:
+            with writer.excel_writer(a) as wa, writer.excel_writer(b) as wb:
+                wa.write(df=df, sheet_name='S')
+                wb.write(df=df, sheet_name='S', start_row=4)
+                wa.write(df=df, sheet_name='S', start_row=5, header=False)
+                wb.write(df=df, sheet_name='T')
+                wa.write(df=df, sheet_name='U')
+                save.assert_not_called()
+        self.assertEqual(sorted(call.args[1] for call in save.call_args_list), [a, b])
+
+        wb_a = openpyxl.load_workbook(a)
+        self.assertEqual(wb_a.sheetnames, ['S', 'U'])
+        self.assertEqual([c.value for c in wb_a['S']['A']], ['A', 1, 2, None, 1, 2])
+        wb_b = openpyxl.load_workbook(b)
+        self.assertEqual(wb_b.sheetnames, ['S', 'T'])
+        self.assertEqual([c.value for c in wb_b['S']['A']], ['old', 0, None, 'A', 1, 2])
+        self.assertEqual([c.value for c in wb_b['T']['A']], ['A', 1, 2])
+
+
+class TestMergeIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(writer.clear_workbook_cache)
+
+    def test_rebuilt_when_merges_change_with_same_count(self):
+        # 调用方取消一个合并区域、再合并另一个，数量不变时索引也要重建
+        df = pd.DataFrame({'A': [1, 2]})
+        with writer.excel_writer(os.path.join(self.tmp.name, 'm.xlsx')) as w:
+            ws = w.workbook.create_sheet('S')
+            ws.merge_cells('A1:B2')
+            w.write(df=df, sheet_name='S', start_row=10)
+            ws.unmerge_cells('A1:B2')
+            ws.merge_cells('D1:E2')
+            with self.assertRaises(ValueError):
+                w.write(df=df, sheet_name='S', start_row=1, start_col=4, merge_policy='error')
+            w.write(df=df, sheet_name='S', start_row=1, start_col=1, merge_policy='error')
+            self.assertEqual(ws['A2'].value, 1)
+
+
+class TestWorkbookCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(writer.clear_workbook_cache)
+        self.path = os.path.join(self.tmp.name, 'drawings.xlsx')
+
+    def make_workbook(self, with_image):
+        from openpyxl.chart import BarChart, Reference
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = 'S'
+        for r in range(1, 5):
+            ws.append([r, r * 2])
+        chart = BarChart()
+        chart.add_data(Reference(ws, min_col=2, min_row=1, max_row=4))
+        ws.add_chart(chart, 'D2')
+        if with_image:
+            from openpyxl.drawing.image import Image
+            from PIL import Image as PILImage
+            buf = io.BytesIO()
+            PILImage.new('RGB', (4, 4), 'red').save(buf, 'PNG')
+            buf.seek(0)
+            ws.add_image(Image(buf), 'H2')
+        wb.save(self.path)
+
+    def write_twice(self):
+        writer.write_to_excel(pd.DataFrame({'x': [1]}), self.path, sheet_name='S', start_row=10, reuse_workbook=True)
+        writer.write_to_excel(pd.DataFrame({'x': [2]}), self.path, sheet_name='S', start_row=12, reuse_workbook=True)
+        return openpyxl.load_workbook(self.path)['S']
+
+    def test_write_twice_keeps_chart(self):
+        self.make_workbook(with_image=False)
+        ws = self.write_twice()
+        self.assertEqual(len(ws._charts), 1)
+        self.assertEqual([ws['A11'].value, ws['A13'].value], [1, 2])
+
+    def test_write_twice_keeps_image(self):
+        # 含图片的工作簿保存一次后图片数据流即关闭，不能缓存复用再次保存
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            self.skipTest("需要安装 Pillow")
+        self.make_workbook(with_image=True)
+        ws = self.write_twice()
+        self.assertEqual((len(ws._charts), len(ws._images)), (1, 1))
+        self.assertEqual([ws['A11'].value, ws['A13'].value], [1, 2])
+
+    def test_not_cached_by_default(self):
+        path = os.path.join(self.tmp.name, 'plain.xlsx')
+        writer.write_to_excel(pd.DataFrame({'x': [1]}), path)
+        writer.write_to_excel(pd.DataFrame({'x': [2]}), path, start_row=5)
+        self.assertFalse(writer._workbook_cache)
+
+    def test_reuse_until_file_replaced(self):
+        # 复用缓存的工作簿；文件被其他程序替换（inode 变化）后即使修改时间与大小相同也重新加载
+        path = os.path.join(self.tmp.name, 'plain.xlsx')
+        writer.write_to_excel(pd.DataFrame({'x': [1]}), path)
+        writer.write_to_excel(pd.DataFrame({'x': [2]}), path, start_row=5, reuse_workbook=True)
+        with mock.patch.object(writer, '_open_or_create_workbook', side_effect=AssertionError):
+            writer.write_to_excel(pd.DataFrame({'x': [3]}), path, start_row=8, reuse_workbook=True)
+        st = os.stat(path)
+        other = os.path.join(self.tmp.name, 'other.xlsx')
+        with open(path, 'rb') as src, open(other, 'wb') as dst:
+            dst.write(src.read())
+        os.utime(other, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(other, path)
+        with mock.patch.object(writer, '_open_or_create_workbook', wraps=writer._open_or_create_workbook) as load:
+            writer.write_to_excel(pd.DataFrame({'x': [4]}), path, start_row=11, reuse_workbook=True)
+        load.assert_called_once()
+        ws = openpyxl.load_workbook(path).active
+        self.assertEqual([ws['A2'].value, ws['A6'].value, ws['A9'].value, ws['A12'].value], [1, 2, 3, 4])
+
+    def test_clear_workbook_cache(self):
+        path = os.path.join(self.tmp.name, 'plain.xlsx')
+        writer.write_to_excel(pd.DataFrame({'x': [1]}), path)
+        writer.write_to_excel(pd.DataFrame({'x': [2]}), path, start_row=5, reuse_workbook=True)
+        self.assertTrue(writer._workbook_cache)
+        writer.clear_workbook_cache()
+        self.assertFalse(writer._workbook_cache)
+
+
+class TestAtomicSave(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'out.xlsx')
+
+    @unittest.skipIf(os.name == 'nt', "Windows 不支持 POSIX 权限位")
+    def test_keeps_existing_mode(self):
+        writer.write_to_excel(pd.DataFrame({'x': [1]}), self.path)
+        os.chmod(self.path, 0o640)
+        writer.write_to_excel(pd.DataFrame({'x': [2]}), self.path, start_row=5)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+        self.assertEqual(os.listdir(self.tmp.name), ['out.xlsx'])
+
+    @unittest.skipIf(os.name == 'nt', "Windows 不支持 POSIX 权限位")
+    def test_new_file_mode_without_umask_call(self):
+        # 保存时不再临时修改进程 umask，新文件使用导入时读取的默认权限
+        with mock.patch.object(writer.os, 'umask', side_effect=AssertionError):
+            writer.write_to_excel(pd.DataFrame({'x': [1]}), self.path)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, writer._NEW_FILE_MODE)
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), "需要支持符号链接")
+    def test_symlink_target_kept(self):
+        # 目标为符号链接时写入链接指向的文件，链接本身保留
+        real = os.path.join(self.tmp.name, 'real.xlsx')
+        writer.write_to_excel(pd.DataFrame({'x': [1]}), real)
+        try:
+            os.symlink(real, self.path)
+        except OSError:
+            self.skipTest("无权限创建符号链接")
+        writer.write_to_excel(pd.DataFrame({'x': [2]}), self.path, start_row=5)
+        self.assertTrue(os.path.islink(self.path))
+        self.assertEqual(openpyxl.load_workbook(real).active['A6'].value, 2)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['out.xlsx', 'real.xlsx'])
+
+    def test_failure_keeps_target_and_removes_temp(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'original')
+
+        def save(path):
+            # 临时文件位于目标文件同目录，且每次保存名称不同
+            self.assertEqual(os.path.dirname(path), self.tmp.name)
+            self.assertNotEqual(path, self.path + '.tmp')
+            with open(path, 'wb') as f:
+                f.write(b'partial')
+            raise OSError('disk full')
+
+        with self.assertRaises(OSError):
+            writer._atomic_save(save, self.path)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b'original')
+        self.assertEqual(os.listdir(self.tmp.name), ['out.xlsx'])
+
+
+@unittest.skipUnless(writer.XLSXWRITER_AVAILABLE, "需要安装 xlsxwriter")
+class TestXlsxwriterNewFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.df = pd.DataFrame({
+            'when': pd.to_datetime(['2024-01-02 03:04:05', None]),
+            'day': [pd.Timestamp('2024-01-02').date(), None],
+            'num': [np.inf, -np.inf],
+            'obj': ['a', np.inf],
+            'nan': [np.nan, 1.5],
+        })
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def cells(self, path, sheet):
+        ws = openpyxl.load_workbook(path)[sheet]
+        return [[(c.value, c.number_format) for c in row] for row in ws.iter_rows()]
+
+    def test_matches_openpyxl_output(self):
+        # 新建文件单次写入走 xlsxwriter，excel_writer 走 openpyxl，两者单元格值与数字格式一致
+        fast = self.path('fast.xlsx')
+        writer.write_to_excel(self.df, fast, sheet_name='Data', start_row=2, start_col=2)
+        slow = self.path('slow.xlsx')
+        with writer.excel_writer(slow) as w:
+            w.write(df=self.df, sheet_name='Data', start_row=2, start_col=2)
+        self.assertEqual(self.cells(fast, 'Data'), self.cells(slow, 'Data'))
+
+    def test_dates_nat_and_inf(self):
+        path = self.path('out.xlsx')
+        writer.write_to_excel(self.df, path, sheet_name='Data')
+        ws = openpyxl.load_workbook(path)['Data']
+        self.assertEqual(ws['A2'].value, pd.Timestamp('2024-01-02 03:04:05').to_pydatetime())
+        self.assertTrue(ws['A2'].is_date)
+        self.assertIsNone(ws['A3'].value)
+        self.assertIsNone(ws['B3'].value)
+        # ±inf 与 openpyxl 路径一致留空，而不是 xlsxwriter 默认的 =1/0 公式
+        self.assertEqual([ws['C2'].value, ws['C3'].value, ws['D2'].value, ws['D3'].value], [None, None, 'a', None])
+        self.assertIsNone(ws['E2'].value)
+        self.assertEqual(ws['E3'].value, 1.5)
+
+    def test_sheet_naming(self):
+        # 整数 sheet_name 与 openpyxl 路径在空工作簿上的命名一致
+        path = self.path('int.xlsx')
+        writer.write_to_excel(self.df, path, sheet_name=0)
+        self.assertEqual(openpyxl.load_workbook(path).sheetnames, ['Sheet1'])
+        path = self.path('named.xlsx')
+        writer.write_to_excel(self.df, path, sheet_name='报表')
+        self.assertEqual(openpyxl.load_workbook(path).sheetnames, ['报表'])
+
+
+if __name__ == '__main__':
+    unittest.main()
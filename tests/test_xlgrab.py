@@ -237,6 +237,27 @@ class TestXlDataFrame(unittest.TestCase):
         with self.assertRaises(ValueError):
             df.excel_range('A1:A10')  # 行超出范围
     
+    def test_compile_range_function(self):
+        """测试预编译Excel区间"""
+        df = xlgrab.XlDataFrame({
+            'A': ['Name', 'Alice', 'Bob', 'Charlie'],
+            'B': ['Age', 25, 30, 35],
+            'C': ['Department', 'IT', 'HR', 'IT'],
+        })
+        grab = xlgrab.XlDataFrame.compile_range('A1:C2', 'A3:C4', header=True, index_col=0)
+        result = grab(df)
+        expected = df.excel_range('A1:C2', 'A3:C4', header=True, index_col=0)
+        pd.testing.assert_frame_equal(result, expected)
+        
+        # 相同参数复用同一个编译结果
+        self.assertIs(grab, xlgrab.XlDataFrame.compile_range('A1:C2', 'A3:C4', header=True, index_col=0))
+        
+        # 区间解析错误在编译时抛出，越界在调用时抛出
+        with self.assertRaises(ValueError):
+            xlgrab.XlDataFrame.compile_range('invalid_range')
+        with self.assertRaises(ValueError):
+            xlgrab.XlDataFrame.compile_range('Z1:Z5')(df)
+    
     def test_offset_range_function(self):
         """测试偏移区间功能"""
         # 创建测试数据
@@ -18,7 +18,9 @@ from .excel import (
     read_excel, 
     write_to_excel, 
     write_range_to_excel, 
-    to_sheet_many
+    to_sheet_many,
+    excel_writer,
+    clear_workbook_cache
 )
 
 # 默认不替换 pandas 类，改为通过 pandas Accessor 暴露功能：
@@ -41,5 +43,7 @@ __all__ = [
     'read_excel',
     'write_to_excel',
     'write_range_to_excel',
-    'to_sheet_many'
+    'to_sheet_many',
+    'excel_writer',
+    'clear_workbook_cache'
 ]
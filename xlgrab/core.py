@@ -61,6 +61,12 @@ class XlDataFrame(_OriginalDataFrame):
         from .excel.range import select_range
         return select_range(self, *args, **kwargs)
     
+    @staticmethod
+    def compile_range(*args, **kwargs):
+        """预解析Excel区间，返回可复用的取数函数"""
+        from .excel.range import compile_range
+        return compile_range(*args, **kwargs)
+    
     # ==================== 数据操作 ====================
     
     def find_idx(self, *args, **kwargs):
@@ -7,9 +7,119 @@
 import pandas as pd
 import numpy as np
 import re
+from collections import Counter, defaultdict
 from typing import Any, Optional, Union, List, Dict, Callable
 
 
+# 列名中需替换为下划线的字符（ASCII 空白即 str.isspace() 为真的 ASCII 字符）
+_SAFE_CHARS = '-:/\\()[].,;：；（）【】{}·' + ''.join(chr(i) for i in range(128) if chr(i).isspace())
+_SAFE_TRANS = str.maketrans(dict.fromkeys(_SAFE_CHARS, '_'))
+# 非 ASCII 列名的替换规则与连续下划线合并，模块级预编译
+_SAFE_RE = re.compile(r'[-:/\\()\[\].,;:：；（）()【】{}·\s]')
+_DEDUP_RE = re.compile(r'_+')
+
+
+def _safe_name(val: Any) -> str:
+    """规范化列名：特殊符号与空白替换为下划线，合并连续下划线并去掉首尾下划线"""
+    val = str(val)
+    # 如果为空字符串或只包含空白字符，返回空字符串（后续会由_dedup_names处理）
+    if not val or val.isspace():
+        return ""
+    if val.isascii():
+        # ASCII 常见情形：单次查表替换，无需正则
+        val = val.translate(_SAFE_TRANS)
+    else:
+        # 非 ASCII 可能含全角空格等 Unicode 空白，仍交给正则 \s 处理
+        val = _SAFE_RE.sub('_', val)
+    if '__' in val:
+        val = _DEDUP_RE.sub('_', val)
+    return val.strip('_')
+
+
+def _safe_names_vec(names) -> List[str]:
+    """批量规范化列名，结果与逐个调用 _safe_name 一致
+
+    列数较多时把替换交给 pandas 的字符串方法整列处理，省去逐格的 Python 调用；
+    列数很少时直接走标量路径。
+    """
+    names = [str(x) for x in names]
+    if len(names) < 8:
+        return [_safe_name(x) for x in names]
+    s = pd.Series(names, dtype=object)
+    cleaned = (
+        s.str.replace(_SAFE_RE, '_', regex=True)
+        .str.replace(_DEDUP_RE, '_', regex=True)
+        .str.strip('_')
+    )
+    # 空字符串或纯空白返回空字符串（后续由 _dedup_names 处理）
+    return cleaned.mask(s.str.isspace(), '').tolist()
+
+
+def _replace_inplace(df, new_df) -> None:
+    """用 new_df 的内容就地替换 df
+
+    直接接管 new_df 的 BlockManager，省去 DataFrame.__init__ 的重新构造；
+    依赖 pandas 内部属性（_mgr/_item_cache），不可用时回退到 __init__。
+    """
+    try:
+        df._mgr = new_df._mgr
+        item_cache = getattr(df, "_item_cache", None)
+        if item_cache is not None:
+            item_cache.clear()
+    except (AttributeError, TypeError):
+        df.__init__(new_df)
+
+
+def _data_block(df, start: int, inplace: bool):
+    """取表头下方的数据切片
+
+    inplace=True 时原表会被整体替换，直接使用切片、不复制数据；
+    inplace=False 且未开启 Copy-on-Write 时切片是原表的视图，需复制一次，避免返回值与调用方共享数据。
+    """
+    block = df.iloc[start:, :]
+    if inplace or _copy_on_write():
+        return block
+    return block.copy()
+
+
+def _copy_on_write() -> bool:
+    """pandas 是否启用了 Copy-on-Write（pandas 3 起已无该选项且始终启用）"""
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except KeyError:
+        return True
+
+
+def _merge_header_columns(header_arr: np.ndarray, header_join: str, fallback) -> List[str]:
+    """多行表头按列合并为单层列名（未做规范化）
+
+    每列跳过缺失值、按出现顺序去重后用 header_join 连接；整列缺失时使用 fallback 中对应的原列名。
+    先对整个表头块做一次 factorize 得到整数编码，去重只比较各行编码，拼接按行向量化，
+    避免逐列逐格的 Python 级去重与 join。
+    """
+    n_rows, n_cols = header_arr.shape
+    codes, uniques = pd.factorize(header_arr.ravel())
+    codes = codes.reshape(n_rows, n_cols)
+    # keep[i, j]：第 i 行的值在第 j 列中首次出现（缺失值编码为 -1，不保留）
+    keep = codes >= 0
+    for i in range(1, n_rows):
+        for k in range(i):
+            keep[i] &= codes[i] != codes[k]
+    # 编码 -1 映射到末尾的空串；逐行做 object 数组的向量化拼接，只在表头行数上循环
+    labels = np.array([str(u) for u in uniques] + [''], dtype=object)
+    cells = labels[codes]
+    merged = np.full(n_cols, '', dtype=object)
+    has_value = np.zeros(n_cols, dtype=bool)
+    for i in range(n_rows):
+        row_keep = keep[i]
+        joined = np.where(has_value, merged + header_join + cells[i], cells[i])
+        merged = np.where(row_keep, joined, merged)
+        has_value |= row_keep
+    for j in np.flatnonzero(~has_value):
+        merged[j] = str(fallback[j])
+    return merged.tolist()
+
+
 def apply_header(
     df,
     header: Union[bool, int, List[int], List[str], pd.DataFrame, pd.Series] = True,
@@ -20,47 +130,36 @@ def apply_header(
     使用本 DataFrame 顶部若干行作为列名。
 
     参数：
-      - header: True 表示首行；整数 N 表示前 N 行；False 返回拷贝不做处理
+      - header: True 表示首行；整数 N 表示前 N 行；False 不做处理（非 inplace 时返回副本）
       - header_join: 当 N>1 时，若提供分隔符则将多行头按分隔符合并为单层列；
                      否则生成 MultiIndex 多级列
       - inplace: 是否直接修改原 DataFrame，默认为 False
 
     返回：
       - 如果 inplace=True，返回 None（直接修改原 DataFrame）
-      - 如果 inplace=False，返回处理后的新 DataFrame
+      - 如果 inplace=False，返回处理后的新 DataFrame（按行号取表头时与原 df 共享数据，不做整表复制）
     """
-    # 通用：构造清洗与去重函数
-    def _safe_name(val: Any) -> str:
-        val = str(val)
-        # 如果为空字符串或只包含空白字符，返回空字符串（后续会由_dedup_names处理）
-        if not val or val.isspace():
-            return ""
-        val = re.sub(r'[-:/\\()\[\].,;:：；（）()【】{}·\s]', '_', val)
-        val = re.sub(r'_+', '_', val)
-        val = val.strip('_')
-        return val
-
+    # 通用：构造去重函数
     def _dedup_names(names: List[str]) -> List[str]:
-        seen: Dict[str, int] = {}
+        # 空字符串以 "_" 为基名计数；先整体计数，只出现一次的名字直接保留，
+        # 仅对重复名与空名走编号逻辑
+        counts = Counter(name or "_" for name in names)
+        seen: Dict[str, int] = defaultdict(int)
         result: List[str] = []
         for name in names:
-            # 如果为空字符串，使用占位列名
+            if name and counts[name] == 1:
+                result.append(name)
+                continue
+            # 如果为空字符串，使用占位列名 _1, _2, ...；重复名后续依次加 _1, _2, ...
+            base = name or "_"
+            count = seen[base]
             if not name:
-                base = "_"
-                count = seen.get(base, 0)
-                if count == 0:
-                    result.append(f"{base}1")  # 第一个空字符串变成 _1
-                else:
-                    result.append(f"{base}{count + 1}")  # 后续变成 _2, _3, ...
-                seen[base] = count + 1
+                result.append(f"{base}{count + 1}")
+            elif count == 0:
+                result.append(base)
             else:
-                base = name
-                count = seen.get(base, 0)
-                if count == 0:
-                    result.append(base)
-                else:
-                    result.append(f"{base}_{count}")
-                seen[base] = count + 1
+                result.append(f"{base}_{count}")
+            seen[base] = count + 1
         return result
 
     def _generate_placeholder_names(num_cols: int) -> List[str]:
@@ -79,23 +178,24 @@ def apply_header(
                 names = _generate_placeholder_names(len(df.columns))
             elif len(names) != len(df.columns):
                 raise ValueError(f"提供的列名数量为 {len(names)}，与 DataFrame 列数 {len(df.columns)} 不一致")
-        cleaned = [_safe_name(x) for x in names]
-        cleaned = _dedup_names(cleaned)
-        if inplace:
-            df.columns = cleaned
-            df.reset_index(drop=True, inplace=True)
-            return None
-        else:
-            out = df.copy()
-            out.columns = cleaned
-            out.reset_index(drop=True, inplace=True)
-            return out
+            cleaned = _safe_names_vec(names)
+            cleaned = _dedup_names(cleaned)
+            if inplace:
+                df.columns = cleaned
+                df.reset_index(drop=True, inplace=True)
+                return None
+            else:
+                out = df.copy()
+                out.columns = cleaned
+                out.reset_index(drop=True, inplace=True)
+                return out
 
     # 2) header 为 DataFrame：按多行表头合并
     if isinstance(header, pd.DataFrame):
         header.ffill(axis=1, inplace=True)
-        header_block = header.astype("string")
-        n = len(header_block)
+        # 一次性取出 object 二维数组（缺失值为 pd.NA），后续按数组整体处理，不再逐行 tolist
+        header_arr = header.astype("string").to_numpy(dtype=object)
+        n = len(header_arr)
         # 如果DataFrame为空，使用占位列名
         if n < 1:
             placeholder_names = _generate_placeholder_names(len(df.columns))
@@ -109,19 +209,13 @@ def apply_header(
                 out.reset_index(drop=True, inplace=True)
                 return out
         # 从当前 df 全量返回（不丢行），仅重命名
-        arrays = [header_block.iloc[i].tolist() for i in range(n)]
         if header_join is None:
-            tuples = [tuple(items) for items in zip(*arrays)]
+            tuples = [tuple(items) for items in header_arr.T.tolist()]
             new_columns = pd.MultiIndex.from_tuples(tuples)
         else:
             # 合并为单层列
-            new_headers: List[str] = []
-            for col_idx, items in enumerate(zip(*arrays)):
-                values = [x for x in items if pd.notna(x)]
-                unique_ordered = list(dict.fromkeys(values))
-                merged = header_join.join(map(str, unique_ordered)) if unique_ordered else str(df.columns[col_idx])
-                new_headers.append(_safe_name(merged))
-            new_columns = _dedup_names(new_headers)
+            merged = _merge_header_columns(header_arr, header_join, df.columns)
+            new_columns = _dedup_names(_safe_names_vec(merged))
         
         if inplace:
             df.columns = new_columns
@@ -133,12 +227,12 @@ def apply_header(
             out.reset_index(drop=True, inplace=True)
             return out
 
-    # 3) header 为 False：不处理
+    # 3) header 为 False：不处理；非 inplace 时返回副本（开启 Copy-on-Write 时浅拷贝即可，不复制底层数据）
     if header is False:
         if inplace:
             return None
         else:
-            return df.copy()
+            return df.copy(deep=not _copy_on_write())
 
     # 4) 与 pandas read_csv 语义对齐：
     #    - header=True 等价于 header=0（使用第0行做表头）
@@ -152,25 +246,20 @@ def apply_header(
         idxs = list(header)
         if min(idxs) < 0 or max(idxs) >= len(df):
             raise ValueError("header 行索引超出范围")
-        header_block = df.iloc[idxs, :].astype("string")
-        data_start = max(idxs) + 1
-        data_block = df.iloc[data_start:, :].copy()
-        arrays = [header_block.iloc[i - idxs[0]].tolist() for i in idxs]
+        # 直接取 object 数组转字符串，缺失值保留为 None 以便合并时跳过
+        header_arr = df.iloc[idxs, :].to_numpy(dtype=object)
+        header_arr = np.where(pd.isna(header_arr), None, header_arr.astype(str))
+        data_block = _data_block(df, max(idxs) + 1, inplace)
         if header_join is None:
-            tuples = [tuple(items) for items in zip(*arrays)]
+            tuples = [tuple(items) for items in header_arr.T.tolist()]
             data_block.columns = pd.MultiIndex.from_tuples(tuples)
         else:
-            new_headers: List[str] = []
-            for col_idx, items in enumerate(zip(*arrays)):
-                values = [x for x in items if pd.notna(x)]
-                unique_ordered = list(dict.fromkeys(values))
-                merged = header_join.join(map(str, unique_ordered)) if unique_ordered else str(df.columns[col_idx])
-                new_headers.append(_safe_name(merged))
-            data_block.columns = _dedup_names(new_headers)
+            merged = _merge_header_columns(header_arr, header_join, df.columns)
+            data_block.columns = _dedup_names(_safe_names_vec(merged))
         data_block.reset_index(drop=True, inplace=True)
         if inplace:
             # 对于多行表头，需要替换整个 DataFrame
-            df.__init__(data_block)
+            _replace_inplace(df, data_block)
             return None
         else:
             return data_block
@@ -180,14 +269,16 @@ def apply_header(
         row_idx = int(header)
         if row_idx < 0 or row_idx >= len(df):
             raise ValueError("header 行索引超出范围")
-        hdr = df.iloc[row_idx, :].astype("string")
-        data_block = df.iloc[row_idx + 1:, :].copy()
-        new_cols = [ _safe_name(x) for x in hdr.tolist() ]
+        # 缺失值转为空字符串，由 _dedup_names 生成占位列名
+        row = df.iloc[row_idx, :].to_numpy(dtype=object)
+        hdr = np.where(pd.isna(row), '', row.astype(str))
+        data_block = _data_block(df, row_idx + 1, inplace)
+        new_cols = _safe_names_vec(hdr.tolist())
         data_block.columns = _dedup_names(new_cols)
         data_block.reset_index(drop=True, inplace=True)
         if inplace:
             # 对于单行表头，需要替换整个 DataFrame
-            df.__init__(data_block)
+            _replace_inplace(df, data_block)
             return None
         else:
             return data_block
@@ -7,7 +7,15 @@
 import pandas as pd
 import numpy as np
 import re
+from functools import lru_cache
 from typing import Any, Optional, Union, List, Dict, Callable
+from pandas.api.types import infer_dtype
+
+
+@lru_cache(maxsize=256)
+def _get_pattern(q: str, flags: int) -> re.Pattern:
+    """编译并缓存正则，循环中重复使用同一查询时免去重复解析"""
+    return re.compile(q, flags)
 
 
 def find_idx_dataframe(
@@ -43,31 +51,36 @@ def find_idx_dataframe(
       - 若未命中且 nth 非 None，返回 -1。
       - 输入无效模式会抛 ValueError。
     """
+    data = _resolve_target(df, target, axis)
+    return find_idx_series(data, q, mode=mode, na=na, flags=flags, nth=nth)
+
+
+def _resolve_target(df, target: Union[str, int], axis: str = "column"):
+    """按 target/axis 取出待搜索的一维数据（整列或整行）"""
     # 自动判断axis：如果 target 是整数且 axis 为 column，则允许以列索引方式查找
     if isinstance(target, int) and axis == "column":
         if 0 <= target < len(df.columns):
-            column_name = df.columns[target]
-            column_data = df[column_name]
-            return find_idx_series(column_data, q, mode=mode, na=na, flags=flags, nth=nth)
-        else:
-            # 列索引越界时回退为按行搜索
-            axis = "row"
+            return df.iloc[:, target]
+        # 列索引越界时回退为按行搜索
+        axis = "row"
     
+    # 用 get_loc 一次哈希查找完成存在性检查与定位，再按位置取数据，
+    # 避免 `in` 检查 + df[target]/df.loc[target] 的重复查找
     if axis == "column":
         # 按列搜索
-        if target not in df.columns:
+        try:
+            loc = df.columns.get_loc(target)
+        except KeyError:
             raise ValueError(f"列 '{target}' 不存在")
-        column_data = df[target]
-        return find_idx_series(column_data, q, mode=mode, na=na, flags=flags, nth=nth)
+        return df.iloc[:, loc] if isinstance(loc, int) else df[target]
     
     elif axis == "row":
         # 按行搜索 - 复用Series的find_idx方法
-        if target not in df.index:
+        try:
+            loc = df.index.get_loc(target)
+        except KeyError:
             raise ValueError(f"行索引 '{target}' 不存在")
-        
-        # 获取指定行的数据
-        row_data = df.loc[target]
-        return find_idx_series(row_data, q, mode=mode, na=na, flags=flags, nth=nth)
+        return df.iloc[loc] if isinstance(loc, int) else df.loc[target]
     
     else:
         raise ValueError("axis must be 'column' or 'row'")
@@ -103,36 +116,153 @@ def find_idx_series(
       - 输入无效模式会抛 ValueError。
     """
     
+    nth = _norm_nth(nth)
+    # 只需单个命中位置时分块扫描、数够即停，不构造整列掩码与全部命中位置
+    scan = nth is not None
+
     # exact：使用底层 ndarray 做等值比较，性能最优
     if mode == "exact":
         arr = series.to_numpy(copy=False)
         if pd.isna(q):
-            # 查找缺失值位置（覆盖 None/np.nan/pd.NA 等）
-            idx = np.flatnonzero(pd.isna(arr))
+            # 查找缺失值位置（覆盖 None/np.nan/pd.NA 等）；整数/布尔数组不可能含缺失值，
+            # 浮点数组直接用 np.isnan，其余类型交给 pd.isna
+            if arr.dtype.kind in "iub":
+                idx = np.empty(0, dtype=np.intp)
+            elif arr.dtype.kind in "fc":
+                idx = np.flatnonzero(np.isnan(arr))
+            else:
+                idx = np.flatnonzero(pd.isna(arr))
         else:
-            idx = np.flatnonzero(arr == q)
-    elif mode == "contains":
+            q, possible = _match_dtype(arr, q)
+            if not possible:
+                idx = np.empty(0, dtype=np.intp)
+            elif scan:
+                return _scan_nth(len(arr), lambda a, b: _eq_mask(arr[a:b], q), nth, _SCAN_CHUNK)
+            else:
+                idx = np.flatnonzero(_eq_mask(arr, q))
+    elif mode in ("contains", "regex"):
         # contains：字面子串匹配（regex=False），避免正则引擎开销与语义歧义
-        arr = series.astype("string")
-        mask = arr.str.contains(str(q), regex=False, na=na)
-        idx = np.flatnonzero(mask.to_numpy())
-    elif mode == "regex":
-        # regex：正则匹配，可通过 flags 控制大小写等
-        arr = series.astype("string")
-        mask = arr.str.contains(q, regex=True, na=na, flags=flags)
-        idx = np.flatnonzero(mask.to_numpy())
+        # regex：正则匹配，可通过 flags 控制大小写等；字符串模式经缓存编译复用
+        arr = _as_string(series)
+        if mode == "contains":
+            q = str(q)
+        elif isinstance(q, str):
+            q, flags = _get_pattern(q, flags), 0
+        if len(arr) and (arr.dtype == object or getattr(arr.dtype, "storage", None) == "python"):
+            # 元素本就是 Python 字符串时直接逐个判断，省去 .str 访问器构造 Series 与结果装箱
+            if mode == "regex" and (flags or not isinstance(q, re.Pattern)):
+                # 与 .str.contains 相同：已编译的模式不能再叠加 flags，非字符串模式报 TypeError
+                q = re.compile(q, flags)
+            values = arr.to_numpy()
+            mask_fn = lambda a, b: _str_mask(values[a:b], q, mode, na)
+        else:
+            mask_fn = lambda a, b: arr.iloc[a:b].str.contains(
+                q, regex=mode == "regex", na=na, flags=flags).to_numpy()
+        if scan:
+            return _scan_nth(len(arr), mask_fn, nth, _STR_SCAN_CHUNK)
+        idx = np.flatnonzero(mask_fn(0, len(arr)))
     else:
         raise ValueError("mode must be 'exact' | 'contains' | 'regex'")
 
-    # 命中次序选择：None → 全部；>0 → 第 n 个；<0 → 从尾部计数
+    return _select_nth(idx, nth)
+
+
+def _match_dtype(arr: np.ndarray, q):
+    """数值数组做等值查找时，把数值 q 转成数组同类型的标量，使比较直接走同类型 ufunc
+
+    返回 (q, 是否可能命中)；q 无法无损转换（如在整数列中找 1.5、溢出）时不可能命中。
+    非数值数组或非数值 q 原样返回。
+    """
+    if arr.dtype.kind not in "iuf" or not isinstance(q, (int, float, np.number)):
+        return q, True
+    try:
+        typed = arr.dtype.type(q)
+    except (OverflowError, ValueError, TypeError):
+        return q, False
+    return typed, bool(typed == q)
+
+
+def _eq_mask(values: np.ndarray, q) -> np.ndarray:
+    """等值比较掩码；object 数组含 pd.NA 时 numpy 比较会抛 TypeError，此时缺失值按未命中处理"""
+    try:
+        return values == q
+    except TypeError:
+        missing = pd.isna(values)
+        mask = np.zeros(len(values), dtype=bool)
+        mask[~missing] = values[~missing] == q
+        return mask
+
+
+def _as_string(series):
+    """返回可直接使用 .str 访问器的字符串数据
+
+    已是 string dtype，或 object 列中非缺失值全为 str 时原样返回，
+    只有混合类型（如数字）才转换为 string dtype，省去一次整列复制。
+    """
+    if isinstance(series.dtype, pd.StringDtype):
+        return series
+    if series.dtype == object and infer_dtype(series, skipna=True) in ("string", "empty"):
+        return series
+    return series.astype("string")
+
+
+def _str_mask(values: np.ndarray, q, mode: str, na) -> np.ndarray:
+    """逐元素判断子串（q 为 str）或正则（q 为 Pattern）是否命中，非字符串（缺失值）取 na，语义同 .str.contains"""
+    if mode == "contains":
+        hits = (q in v if isinstance(v, str) else na for v in values)
+    else:
+        search = q.search
+        hits = (search(v) is not None if isinstance(v, str) else na for v in values)
+    return np.fromiter(hits, dtype=bool, count=len(values))
+
+
+# 分块扫描的块大小：块内仍走向量化比较，命中靠前（或靠后）时无需处理整列
+_SCAN_CHUNK = 4096
+_STR_SCAN_CHUNK = 65536
+
+
+def _scan_nth(size: int, mask_fn: Callable[[int, int], np.ndarray], nth: int, chunk: int) -> int:
+    """分块计算命中掩码并计数，数到第 nth 个命中即返回其位置
+
+    mask_fn(start, stop) 返回 [start, stop) 区间的布尔掩码；nth<0 时从尾部分块倒数。
+    未命中返回 -1。
+    """
+    remaining = abs(nth)
+    if nth > 0:
+        bounds = ((start, min(start + chunk, size)) for start in range(0, size, chunk))
+    else:
+        bounds = ((max(0, stop - chunk), stop) for stop in range(size, 0, -chunk))
+    for start, stop in bounds:
+        hits = np.flatnonzero(mask_fn(start, stop))
+        if hits.size >= remaining:
+            return start + int(hits[remaining - 1] if nth > 0 else hits[-remaining])
+        remaining -= hits.size
+    return -1
+
+
+@lru_cache(maxsize=32, typed=True)
+def _norm_nth(nth: Optional[int]) -> Optional[int]:
+    """校验 nth：None 或非零整数原样返回，否则抛 ValueError
+
+    nth 几乎总是 1、-1 这类少数常量，结果按值（区分类型）缓存，入口处只需一次查表。
+    """
     if nth is None:
-        return idx
+        return None
     if nth == 0:
         raise ValueError("nth must be a non-zero integer or None")
     
     # 确保nth是整数类型
     if not isinstance(nth, int):
         raise ValueError("nth must be an integer or None")
+    return nth
+
 
+def _select_nth(idx: np.ndarray, nth: Optional[int]):
+    """命中次序选择：None → 全部；>0 → 第 n 个；<0 → 从尾部计数；未命中返回 -1
+
+    nth 须已经过 _norm_nth 校验。
+    """
+    if nth is None:
+        return idx
     k = nth - 1 if nth > 0 else idx.size + nth
     return int(idx[k]) if 0 <= k < idx.size else -1
@@ -6,8 +6,8 @@ xlgrab Excel 操作模块
 
 from .merger import unmerge_excel, unmerge_sheet
 from .reader import read_excel_range as read_excel
-from .range import excel_range, offset_range, select_range
-from .writer import write_to_excel, write_range_to_excel, to_sheet_many
+from .range import excel_range, offset_range, select_range, compile_range
+from .writer import write_to_excel, write_range_to_excel, to_sheet_many, excel_writer, clear_workbook_cache
 
 __all__ = [
     'unmerge_excel',
@@ -16,7 +16,10 @@ __all__ = [
     'excel_range',
     'offset_range',
     'select_range',
+    'compile_range',
     'write_to_excel',
     'write_range_to_excel',
     'to_sheet_many',
+    'excel_writer',
+    'clear_workbook_cache',
 ]
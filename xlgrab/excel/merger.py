@@ -6,16 +6,42 @@ Excel 合并单元格处理模块
 
 import pandas as pd
 import numpy as np
-from typing import Any, Optional, Union, List, Dict, Tuple
+from typing import Any, Callable, Literal, Optional, Union, List, Dict, Tuple
 import warnings
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+import posixpath
+import zipfile
 import openpyxl
+from openpyxl.cell.cell import Cell
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string, get_column_letter, range_boundaries
+from openpyxl.worksheet.cell_range import MultiCellRange
+from openpyxl.worksheet.formula import ArrayFormula
+
+from .writer import _atomic_save
+
+# lxml 仅 fast 模式需要，未安装时在使用时提示
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
 
 
 def unmerge_excel(file_path: Union[str, List[str]], 
                   output_path: Optional[Union[str, List[str]]] = None,
                   sheet_names: Optional[Union[str, List[str]]] = None,
-                  copy_style: bool = True,
-                  verbose: bool = False) -> Dict:
+                  copy_style: Union[bool, Literal['all']] = True,
+                  verbose: bool = False,
+                  parallel: bool = False,
+                  fast: bool = False) -> Dict:
     """
     解开Excel文件中的所有合并单元格并填充值
     
@@ -23,8 +49,13 @@ def unmerge_excel(file_path: Union[str, List[str]],
     file_path: 输入Excel文件路径或文件路径列表
     output_path: 输出Excel文件路径或路径列表，如果为None则覆盖原文件
     sheet_names: 要处理的工作表名称或名称列表，None表示处理所有工作表
-    copy_style: 是否复制单元格格式（数字格式、数据类型等），默认True
+    copy_style: 是否复制单元格格式（数字格式与数据类型），默认True；
+               'all' 时复制源单元格的完整样式（字体、边框、填充、对齐等）
     verbose: 是否显示详细处理信息
+    parallel: 多个文件时是否用多进程并行处理（各文件相互独立），默认False；
+              适合文件多且单个文件较大的场景，spawn 启动方式下需将调用放在 `if __name__ == "__main__":` 中
+    fast: 是否直接改写工作表 XML（需安装 lxml），不经 openpyxl 构建单元格对象，默认False。
+          该模式下填充的单元格总是复制源单元格的完整样式（相当于 copy_style='all'，日期等依赖样式区分），忽略 copy_style
     
     返回:
     Dict: 处理结果统计
@@ -72,80 +103,26 @@ def unmerge_excel(file_path: Union[str, List[str]],
     else:
         sheet_list = None
     
-    total_files = 0
-    total_sheets = 0
-    total_merged = 0
-    files_info = []
+    # 处理每个文件：多个文件时分发到进程池并行处理，结果按输入顺序汇总
+    tasks = list(zip(file_list, output_list))
+    if parallel and len(tasks) > 1:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_process_one_file, input_file, output_file, sheet_list, copy_style, verbose, fast)
+                for input_file, output_file in tasks
+            ]
+            files_info = [future.result() for future in futures]
+    else:
+        files_info = [
+            _process_one_file(input_file, output_file, sheet_list, copy_style, verbose, fast)
+            for input_file, output_file in tasks
+        ]
     
-    # 处理每个文件
-    for input_file, output_file in zip(file_list, output_list):
-        if verbose:
-            print(f"\n{'='*60}")
-            print(f"处理文件: {input_file}")
-            print(f"{'='*60}")
-        
-        try:
-            # 加载工作簿
-            workbook = openpyxl.load_workbook(input_file)
-            
-            # 确定要处理的工作表
-            if sheet_list is None:
-                sheets_to_process = workbook.sheetnames
-            else:
-                # 验证工作表是否存在
-                sheets_to_process = []
-                for sheet_name in sheet_list:
-                    if sheet_name in workbook.sheetnames:
-                        sheets_to_process.append(sheet_name)
-                    elif verbose:
-                        print(f"警告: 工作表 '{sheet_name}' 不存在于文件 {input_file}")
-            
-            file_merged = 0
-            sheets_info = []
-            
-            # 处理每个工作表
-            for sheet_name in sheets_to_process:
-                worksheet = workbook[sheet_name]
-                
-                # 调用 unmerge_sheet 处理
-                result = unmerge_sheet(worksheet, copy_style=copy_style, verbose=False)
-                
-                file_merged += result['merged_count']
-                sheets_info.append({
-                    'sheet_name': sheet_name,
-                    'merged_count': result['merged_count']
-                })
-                
-                if verbose and result['merged_count'] > 0:
-                    print(f"  工作表 '{sheet_name}': 处理了 {result['merged_count']} 个合并单元格")
-            
-            # 保存文件
-            workbook.save(output_file)
-            
-            total_files += 1
-            total_sheets += len(sheets_info)
-            total_merged += file_merged
-            
-            files_info.append({
-                'input_file': input_file,
-                'output_file': output_file,
-                'sheets_count': len(sheets_info),
-                'merged_count': file_merged,
-                'sheets_info': sheets_info
-            })
-            
-            if verbose:
-                print(f"  已保存到: {output_file}")
-                print(f"  共处理 {file_merged} 个合并单元格")
-        
-        except Exception as e:
-            if verbose:
-                print(f"  处理失败: {e}")
-            files_info.append({
-                'input_file': input_file,
-                'output_file': output_file,
-                'error': str(e)
-            })
+    succeeded = [info for info in files_info if 'error' not in info]
+    total_files = len(succeeded)
+    total_sheets = sum(info['sheets_count'] for info in succeeded)
+    total_merged = sum(info['merged_count'] for info in succeeded)
     
     result = {
         'total_files': total_files,
@@ -162,13 +139,291 @@ def unmerge_excel(file_path: Union[str, List[str]],
     return result
 
 
-def unmerge_sheet(worksheet, copy_style: bool = True, verbose: bool = False) -> Dict:
+def _process_one_file(input_file: str,
+                      output_file: str,
+                      sheet_list: Optional[List[str]],
+                      copy_style: Union[bool, Literal['all']],
+                      verbose: bool,
+                      fast: bool = False) -> Dict:
+    """
+    处理单个文件并保存，返回该文件的处理信息；失败时返回带 error 的信息而不抛出
+    
+    定义在模块顶层，以便提交到进程池执行
+    """
+    if verbose:
+        print(f"\n{'='*60}")
+        print(f"处理文件: {input_file}")
+        print(f"{'='*60}")
+    
+    try:
+        if fast:
+            return _process_one_file_fast(input_file, output_file, sheet_list, verbose)
+        
+        # 加载工作簿
+        workbook = openpyxl.load_workbook(input_file)
+        
+        # 确定要处理的工作表
+        if sheet_list is None:
+            sheets_to_process = workbook.sheetnames
+        else:
+            # 验证工作表是否存在
+            sheets_to_process = []
+            for sheet_name in sheet_list:
+                if sheet_name in workbook.sheetnames:
+                    sheets_to_process.append(sheet_name)
+                elif verbose:
+                    print(f"警告: 工作表 '{sheet_name}' 不存在于文件 {input_file}")
+        
+        file_merged = 0
+        sheets_info = []
+        
+        # 处理每个工作表
+        for sheet_name in sheets_to_process:
+            worksheet = workbook[sheet_name]
+            
+            # 调用 unmerge_sheet 处理
+            result = unmerge_sheet(worksheet, copy_style=copy_style, verbose=False)
+            
+            file_merged += result['merged_count']
+            sheets_info.append({
+                'sheet_name': sheet_name,
+                'merged_count': result['merged_count']
+            })
+            
+            if verbose and result['merged_count'] > 0:
+                print(f"  工作表 '{sheet_name}': 处理了 {result['merged_count']} 个合并单元格")
+        
+        # 保存文件
+        workbook.save(output_file)
+        
+        if verbose:
+            print(f"  已保存到: {output_file}")
+            print(f"  共处理 {file_merged} 个合并单元格")
+        
+        return {
+            'input_file': input_file,
+            'output_file': output_file,
+            'sheets_count': len(sheets_info),
+            'merged_count': file_merged,
+            'sheets_info': sheets_info
+        }
+    
+    except Exception as e:
+        if verbose:
+            print(f"  处理失败: {e}")
+        return {
+            'input_file': input_file,
+            'output_file': output_file,
+            'error': str(e)
+        }
+
+
+def _process_one_file_fast(input_file: str,
+                           output_file: str,
+                           sheet_list: Optional[List[str]],
+                           verbose: bool) -> Dict:
+    """
+    fast 模式：直接改写 xlsx 中的工作表 XML 解开合并单元格
+    
+    将每个合并区域左上角的 <c> 元素（连同样式）复制到区域内其余位置并删除 <mergeCells>，
+    其余压缩包成员原样拷贝，不经 openpyxl 构建任何单元格对象
+    """
+    if not LXML_AVAILABLE:
+        raise ImportError("fast 模式需要安装 lxml 库")
+    
+    with zipfile.ZipFile(input_file) as zin:
+        sheet_parts = _sheet_parts(zin)
+        if sheet_list is None:
+            sheets_to_process = list(sheet_parts)
+        else:
+            sheets_to_process = []
+            for sheet_name in sheet_list:
+                if sheet_name in sheet_parts:
+                    sheets_to_process.append(sheet_name)
+                elif verbose:
+                    print(f"警告: 工作表 '{sheet_name}' 不存在于文件 {input_file}")
+        
+        rewritten = {}
+        sheets_info = []
+        file_merged = 0
+        for sheet_name in sheets_to_process:
+            part = sheet_parts[sheet_name]
+            root = etree.fromstring(zin.read(part))
+            merged_count = _unmerge_sheet_xml(root)
+            if merged_count:
+                rewritten[part] = etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+            file_merged += merged_count
+            sheets_info.append({'sheet_name': sheet_name, 'merged_count': merged_count})
+            if verbose and merged_count > 0:
+                print(f"  工作表 '{sheet_name}': 处理了 {merged_count} 个合并单元格")
+        
+    def write_zip(path: str) -> None:
+        with zipfile.ZipFile(input_file) as zin, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zout:
+            for item in zin.infolist():
+                data = rewritten.get(item.filename)
+                if data is None:
+                    data = zin.read(item.filename)
+                zout.writestr(item, data)
+    
+    # 与写入模块相同：先写同目录临时文件再替换（支持输出路径与输入相同），并保留原文件权限
+    _atomic_save(write_zip, output_file)
+    
+    if verbose:
+        print(f"  已保存到: {output_file}")
+        print(f"  共处理 {file_merged} 个合并单元格")
+    
+    return {
+        'input_file': input_file,
+        'output_file': output_file,
+        'sheets_count': len(sheets_info),
+        'merged_count': file_merged,
+        'sheets_info': sheets_info
+    }
+
+
+def _sheet_parts(zin: zipfile.ZipFile) -> Dict[str, str]:
+    """读取 workbook.xml 及其关系文件，返回 {工作表名: 压缩包内 XML 路径}（按工作簿顺序）"""
+    workbook = etree.fromstring(zin.read("xl/workbook.xml"))
+    rels = etree.fromstring(zin.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{{{_NS_PKG_REL}}}Relationship")}
+    parts = {}
+    for sheet in workbook.iter(f"{{{_NS_MAIN}}}sheet"):
+        target = targets.get(sheet.get(f"{{{_NS_REL}}}id"))
+        if target is None:
+            continue
+        # Target 可能是相对 xl/ 的路径，也可能是以 / 开头的包内绝对路径
+        part = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+        if part in zin.namelist() and part.startswith("xl/worksheets/"):
+            parts[sheet.get("name")] = part
+    return parts
+
+
+def _unmerge_sheet_xml(root) -> int:
+    """在工作表 XML 树上解开全部合并区域并复制源单元格，返回处理的合并区域数量"""
+    merge_cells = root.find(f"{{{_NS_MAIN}}}mergeCells")
+    if merge_cells is None:
+        return 0
+    refs = [mc.get("ref") for mc in merge_cells.iter(f"{{{_NS_MAIN}}}mergeCell")]
+    root.remove(merge_cells)
+    
+    sheet_data = root.find(f"{{{_NS_MAIN}}}sheetData")
+    rows = {}
+    cells = {}
+    row_idx = 0
+    for row_el in sheet_data.iter(f"{{{_NS_MAIN}}}row"):
+        # r 属性可省略，省略时按顺序递增；补写后插入新单元格时可直接按坐标定位
+        row_idx = int(row_el.get("r") or row_idx + 1)
+        row_el.set("r", str(row_idx))
+        rows[row_idx] = row_el
+        col_idx = 0
+        for c in row_el.iter(f"{{{_NS_MAIN}}}c"):
+            coord = c.get("r")
+            if coord:
+                col_idx = column_index_from_string(coordinate_from_string(coord)[0])
+            else:
+                col_idx += 1
+                c.set("r", f"{get_column_letter(col_idx)}{row_idx}")
+            cells[(row_idx, col_idx)] = c
+    
+    masters = None
+    def shared_masters() -> Dict[str, Tuple[str, str]]:
+        # 共享公式主单元格：si -> (公式, 坐标)；只有合并区域左上角是共享公式从属单元格时才需要，按需扫描一次
+        nonlocal masters
+        if masters is None:
+            masters = {}
+            for c in cells.values():
+                f = c.find(f"{{{_NS_MAIN}}}f")
+                if f is not None and f.get("t") == "shared" and f.text and f.get("ref"):
+                    masters[f.get("si")] = (f.text, c.get("r"))
+        return masters
+    
+    for ref in refs:
+        min_col, min_row, max_col, max_row = range_boundaries(ref)
+        source = cells.get((min_row, min_col))
+        template = _cell_template(source, shared_masters)
+        array_formula = template is not None and template.find(f"{{{_NS_MAIN}}}f[@t='array']") is not None
+        for row in range(min_row, max_row + 1):
+            row_el = rows.get(row)
+            if row_el is None:
+                row_el = _insert_row(sheet_data, rows, row)
+            row_el.attrib.pop("spans", None)
+            for col in range(min_col, max_col + 1):
+                if row == min_row and col == min_col:
+                    continue
+                old = cells.get((row, col))
+                if template is None:
+                    # 源单元格不存在（空值）：清空目标单元格
+                    if old is not None:
+                        row_el.remove(old)
+                        del cells[(row, col)]
+                    continue
+                new = copy.deepcopy(template)
+                coord = f"{get_column_letter(col)}{row}"
+                new.set("r", coord)
+                if array_formula:
+                    # 数组公式的 ref 改为所在单元格本身，避免各副本的数组区域相互重叠
+                    new.find(f"{{{_NS_MAIN}}}f").set("ref", coord)
+                if old is not None:
+                    row_el.replace(old, new)
+                else:
+                    _insert_cell(row_el, cells, row, col, new)
+                cells[(row, col)] = new
+    return len(refs)
+
+
+def _cell_template(source, shared_masters: Callable[[], Dict[str, Tuple[str, str]]]):
+    """由源 <c> 生成用于复制的模板；共享公式拆为普通公式，数组公式的 ref 由调用方按目标单元格改写
+
+    从属单元格的公式由主单元格公式平移到其位置得到（与 openpyxl 读取时相同），找不到主单元格时仅保留缓存值。
+    """
+    if source is None:
+        return None
+    template = copy.deepcopy(source)
+    f = template.find(f"{{{_NS_MAIN}}}f")
+    if f is not None and f.get("t") == "shared":
+        if not f.text:
+            master = shared_masters().get(f.get("si"))
+            if master is not None:
+                text, origin = master
+                f.text = Translator("=" + text, origin=origin).translate_formula(source.get("r"))[1:]
+        if f.text:
+            for attr in ("t", "ref", "si"):
+                f.attrib.pop(attr, None)
+        else:
+            template.remove(f)
+    return template
+
+
+def _insert_row(sheet_data, rows: Dict[int, Any], row: int):
+    """按行号顺序插入新的 <row> 元素"""
+    row_el = etree.Element(f"{{{_NS_MAIN}}}row", r=str(row))
+    following = [r for r in rows if r > row]
+    if following:
+        rows[min(following)].addprevious(row_el)
+    else:
+        sheet_data.append(row_el)
+    rows[row] = row_el
+    return row_el
+
+
+def _insert_cell(row_el, cells: Dict[Tuple[int, int], Any], row: int, col: int, new) -> None:
+    """按列号顺序把 <c> 插入所在行"""
+    for c in row_el.iter(f"{{{_NS_MAIN}}}c"):
+        col_letter, _ = coordinate_from_string(c.get("r"))
+        if column_index_from_string(col_letter) > col:
+            c.addprevious(new)
+            return
+    row_el.append(new)
+
+
+def unmerge_sheet(worksheet, copy_style: Union[bool, Literal['all']] = True, verbose: bool = False) -> Dict:
     """
     取消单个工作表中的所有合并单元格并填充值
     
     参数:
     worksheet: openpyxl 工作表对象
-    copy_style: 是否复制单元格格式（数字格式、数据类型等），默认True
+    copy_style: 是否复制单元格格式（数字格式与数据类型），默认True；
+               'all' 时复制源单元格的完整样式（字体、边框、填充、对齐等）
     verbose: 是否显示详细处理信息
     
     返回:
@@ -224,17 +479,13 @@ def unmerge_sheet(worksheet, copy_style: bool = True, verbose: bool = False) ->
         print("开始取消合并...")
         print(f"{'='*60}")
     
-    unmerged_count = 0
-    for info in merge_info:
-        try:
-            worksheet.unmerge_cells(info['range'])
-            unmerged_count += 1
-            if verbose:
-                print(f"  ✓ 已取消合并: {info['range']}")
-        except ValueError as e:
-            if verbose:
-                print(f"  ✗ 无法取消合并: {info['range']} - {e}")
-            continue
+    # 一次性清空合并区域登记，替代逐个 unmerge_cells（后者每次都重新解析区间字符串
+    # 并逐格删除占位单元格）；区域内的占位单元格在填充时被直接覆盖
+    worksheet.merged_cells = MultiCellRange()
+    unmerged_count = len(merge_info)
+    if verbose:
+        for info in merge_info:
+            print(f"  ✓ 已取消合并: {info['range']}")
     
     if verbose:
         print(f"\n成功取消 {unmerged_count}/{len(merge_info)} 个合并单元格")
@@ -252,37 +503,46 @@ def unmerge_sheet(worksheet, copy_style: bool = True, verbose: bool = False) ->
         # 获取源单元格（合并单元格的左上角）
         source_cell = worksheet.cell(min_row, min_col)
         value = source_cell.value
+        number_format = source_cell.number_format
+        data_type = source_cell.data_type
+        # 填充单元格的样式模板：默认只带数字格式，copy_style='all' 时为源单元格的完整样式
+        if copy_style == 'all':
+            source_style = source_cell._style
+        else:
+            source_style = StyleArray()
+            source_style.numFmtId = source_cell._style.numFmtId
         
         if verbose:
             print(f"\n[{info['index']}] 填充 {info['range']} 为 '{value}'")
-            print(f"    数字格式: {source_cell.number_format}")
-            print(f"    数据类型: {source_cell.data_type}")
+            print(f"    数字格式: {number_format}")
+            print(f"    数据类型: {data_type}")
         
-        cells_filled = 0
-        for row in range(min_row, max_row + 1):
-            for col in range(min_col, max_col + 1):
-                target_cell = worksheet.cell(row, col)
-                old_value = target_cell.value
-                
-                # 复制值
-                target_cell.value = value
-                
-                # 复制格式（如果启用）
-                if copy_style:
-                    if source_cell.number_format:
-                        target_cell.number_format = source_cell.number_format
-                    if source_cell.data_type:
-                        target_cell.data_type = source_cell.data_type
-                
-                cells_filled += 1
-                
-                if verbose:
-                    from openpyxl.utils import get_column_letter
-                    col_letter = get_column_letter(col)
-                    if old_value != value:
-                        print(f"    {col_letter}{row}: '{old_value}' -> '{value}' (格式: {target_cell.number_format})")
-                    else:
-                        print(f"    {col_letter}{row}: '{value}' (不变, 格式: {target_cell.number_format})")
+        # 直接写入 worksheet._cells，绕过 worksheet.cell 的逐格查找与创建
+        cells = worksheet._cells
+        cells_filled = (max_row - min_row + 1) * (max_col - min_col + 1)
+        targets = [
+            (row, col)
+            for row in range(min_row, max_row + 1)
+            for col in range(min_col, max_col + 1)
+        ][1:]  # 首个位置是源单元格本身，保持不变
+        if not verbose:
+            # 整块一次性写入，循环内不再有逐格分支
+            cells.update(
+                ((row, col), _fill_cell(worksheet, row, col, value, data_type, source_style, copy_style))
+                for row, col in targets
+            )
+        else:
+            # 列字母每个合并区域只算一次，不在逐格输出时重复换算
+            letters = [get_column_letter(c) for c in range(min_col, max_col + 1)]
+            print(f"    {letters[0]}{min_row}: '{value}' (不变, 格式: {source_cell.number_format})")
+            for row, col in targets:
+                target_cell = _fill_cell(worksheet, row, col, value, data_type, source_style, copy_style)
+                cells[(row, col)] = target_cell
+                col_letter = letters[col - min_col]
+                if value is not None:
+                    print(f"    {col_letter}{row}: 'None' -> '{value}' (格式: {target_cell.number_format})")
+                else:
+                    print(f"    {col_letter}{row}: '{value}' (不变, 格式: {target_cell.number_format})")
         
         fill_count += 1
         if verbose:
@@ -297,3 +557,20 @@ def unmerge_sheet(worksheet, copy_style: bool = True, verbose: bool = False) ->
         'merged_count': len(merge_info),
         'merge_details': merge_info
     }
+
+
+def _fill_cell(worksheet, row: int, col: int, value: Any, data_type: str, source_style,
+               copy_style: Union[bool, Literal['all']]) -> Cell:
+    """构造解开合并后用于填充的单元格"""
+    if isinstance(value, ArrayFormula):
+        # 数组公式的 ref 改为所在单元格本身，避免各副本的数组区域相互重叠
+        value = ArrayFormula(f"{get_column_letter(col)}{row}", value.text)
+    if not copy_style:
+        return Cell(worksheet, row=row, column=col, value=value)
+    # 复制格式：值与数据类型直接写入，样式直接复制预先构造的样式 id 数组，
+    # 省去逐项属性赋值与值类型推断
+    cell = Cell(worksheet, row=row, column=col)
+    cell._value = value
+    cell.data_type = data_type
+    cell._style = copy.copy(source_style)
+    return cell
@@ -7,9 +7,12 @@ Excel 范围操作模块
 import pandas as pd
 import numpy as np
 import re
+from functools import lru_cache
 from typing import Any, Optional, Union, List, Dict, Callable
 import warnings
 
+from ..data.search import find_idx_dataframe, find_idx_series, _resolve_target, _as_string, _norm_nth
+
 # 尝试导入openpyxl，如果失败则在使用时提示
 try:
     from openpyxl.utils import coordinate_to_tuple
@@ -17,12 +20,86 @@ try:
 except ImportError:
     OPENPYXL_AVAILABLE = False
 
+@lru_cache(maxsize=4096)
+def _cached_range_boundaries(range_str: str):
+    """缓存 openpyxl 的 range_boundaries 解析结果；批量处理时同样的区间字符串会反复出现"""
+    from openpyxl.utils import range_boundaries
+    return range_boundaries(range_str)
+
+
+@lru_cache(maxsize=4096)
+def _cached_coord_to_tuple(coord: str):
+    """缓存 openpyxl 的 coordinate_to_tuple 解析结果，返回 (行, 列)
+
+    绝对引用（如 '$B$10'）与相对引用等价：openpyxl 不接受 '$'，解析前先去掉。
+    """
+    return coordinate_to_tuple(coord.replace('$', ''))
+
+
+@lru_cache(maxsize=1024)
+def _excel_col_to_idx(col_label: str) -> int:
+    """列字母转 1 基列号（A→1, B→2 ...），结果经缓存复用"""
+    col_label = col_label.strip().upper()
+    # 校验一次完成：只允许 A-Z
+    if col_label and not (col_label.isascii() and col_label.isalpha()):
+        raise ValueError(f"无效的列标记: {col_label}")
+    val = 0
+    for ch in col_label:
+        val = val * 26 + (ord(ch) - 64)
+    return val
+
+
+def _clamp(v: int, lo: int, hi: int) -> int:
+    """等价于 max(lo, min(v, hi))，用比较代替两次内置函数调用"""
+    if v > hi:
+        v = hi
+    return lo if v < lo else v
+
+
+# 单元格坐标，如 'A2'、'$B$10'
+_CELL_PATTERN = re.compile(r'^\$?[A-Za-z]+\$?[0-9]+$')
+
+
+def _is_cell_str(s) -> bool:
+    """是否为单元格坐标字符串：一次正则匹配完成字母+数字的判断"""
+    return isinstance(s, str) and _CELL_PATTERN.match(s) is not None
+
+
+def _fast_iloc(df, r0: int, r1: int, c0: int, c1: int, copy: bool = True):
+    """按 0 基半开区间 [r0, r1) × [c0, c1) 取子表
+
+    copy=True 时返回独立副本：单一 ndarray 块（同构 dtype）时直接切底层数组，
+    绕过 .iloc 的索引分发；其余情况回退到 df.iloc[...].copy()。
+    copy=False 时直接返回 df.iloc[...] 切片，不复制数据。
+    """
+    if not copy:
+        return df.iloc[r0:r1, c0:c1]
+    try:
+        mgr = df._mgr
+        if getattr(mgr, 'nblocks', 2) == 1:
+            blk = mgr.blocks[0]
+            vals = blk.values
+            locs = blk.mgr_locs
+            # 块内列顺序必须与 DataFrame 列顺序一致
+            if (isinstance(vals, np.ndarray) and vals.ndim == 2
+                    and locs.is_slice_like and locs.as_slice == slice(0, len(df.columns), 1)):
+                return pd.DataFrame(
+                    vals[c0:c1, r0:r1].T.copy(),
+                    columns=df.columns[c0:c1],
+                    index=df.index[r0:r1],
+                )
+    except (AttributeError, TypeError):
+        # pandas 内部结构随版本变化，取不到时走通用路径
+        pass
+    return df.iloc[r0:r1, c0:c1].copy()
+
 
 def excel_range(
     df,
     *ranges,
     header: bool = True,
     index_col: Optional[Union[int, str]] = None,
+    copy: bool = True,
 ):
     """
     将Excel数据区间转换为DataFrame的数据区间，支持多个区域合并
@@ -32,6 +109,9 @@ def excel_range(
                 也支持多个区域，如 'B2:D6,K9:L11,K13:L15'
       - header: 是否将第一行作为列名
       - index_col: 指定作为索引的列（列名或列索引）
+      - copy: 是否返回独立副本（默认 True）。copy=False 时直接返回切片、不复制数据，
+              结果与原 DataFrame 共享内存：未启用 Copy-on-Write 时修改结果会同时改动原表，
+              仅在只读使用结果时传 copy=False
     
     返回：
       - DataFrame: 转换后的DataFrame
@@ -51,43 +131,111 @@ def excel_range(
     if not ranges:
         raise ValueError("至少需要提供一个Excel区间")
     
-    # 处理多个区域
-    all_dfs = []
+    # 单个区间（最常见）：直接切片，跳过区间拆分与多区域合并
+    if len(ranges) == 1 and ',' not in ranges[0]:
+        return _finish_single(_parse_excel_range(df, ranges[0], copy=False), header, index_col, copy)
     
+    # 处理多个区域：各区域先取切片，需要副本时在收尾阶段统一复制
+    all_dfs = [_parse_excel_range(df, range_str, copy=False) for range_str in _split_ranges(ranges)]
+    return _finish_range(all_dfs, header, index_col, copy)
+
+
+def compile_range(
+    *ranges,
+    header: bool = True,
+    index_col: Optional[Union[int, str]] = None,
+    copy: bool = True,
+) -> Callable:
+    """
+    预先解析一组Excel区间，返回可重复调用的取数函数 f(df) -> DataFrame
+
+    适用于对大量结构相同的 DataFrame 反复执行同一 excel_range 的场景：
+    区间字符串只解析一次，之后每次调用只做边界检查与切片。
+    参数与 excel_range 相同；相同参数的编译结果会被缓存复用。
+
+    示例：
+      grab = XlDataFrame.compile_range('A1:C5', 'A8:C9', header=True)
+      for df in frames:
+          out = grab(df)  # 等价于 df.excel_range('A1:C5', 'A8:C9', header=True)
+    """
+    if not ranges:
+        raise ValueError("至少需要提供一个Excel区间")
+    return _compile_range(tuple(_split_ranges(ranges)), header, index_col, copy)
+
+
+@lru_cache(maxsize=128)
+def _compile_range(range_strs: tuple, header: bool, index_col, copy: bool):
+    """按规范化后的区间元组生成取数函数（带缓存）"""
+    bounds = []
+    for range_str in range_strs:
+        try:
+            bounds.append(_range_bounds(range_str))
+        except Exception as e:
+            raise ValueError(f"无法解析Excel区间 '{range_str}': {e}")
+    bounds = tuple(bounds)
+
+    def _compiled(df):
+        all_dfs = []
+        for range_str, bound in zip(range_strs, bounds):
+            try:
+                all_dfs.append(_slice_bounds(df, bound, range_str, copy=False))
+            except Exception as e:
+                raise ValueError(f"无法解析Excel区间 '{range_str}': {e}")
+        return _finish_range(all_dfs, header, index_col, copy)
+
+    return _compiled
+
+
+def _split_ranges(ranges) -> List[str]:
+    """展开区间参数：逗号分隔的多区间（如 'B2:D6,K9:L11'）拆成单个区间"""
+    range_strs = []
     for range_str in ranges:
-        # 解析Excel区间
         if ',' in range_str:
-            # 处理多个区间，如 'B2:D6,K9:L11'
-            sub_ranges = range_str.split(',')
-            for sub_range in sub_ranges:
-                range_df = _parse_excel_range(df, sub_range.strip())
-                all_dfs.append(range_df)
+            range_strs.extend(sub_range.strip() for sub_range in range_str.split(','))
         else:
-            # 单个区间
-            range_df = _parse_excel_range(df, range_str)
-            all_dfs.append(range_df)
-    
+            range_strs.append(range_str)
+    return range_strs
+
+
+def _finish_range(all_dfs: List[pd.DataFrame], header: bool, index_col, copy: bool = True):
+    """合并各区域结果，并处理 header 与 index_col
+
+    各区域传入的是原表切片；多区域合并本身产生新数据，只有单个区域时才需在收尾阶段复制。
+    """
     # 合并所有区域
     if len(all_dfs) == 1:
         result_df = all_dfs[0]
     else:
         # 垂直合并多个区域
-        result_df = pd.concat(all_dfs, ignore_index=True)
-    
+        result_df = _stack_frames(all_dfs)
+        copy = False
+    return _finish_single(result_df, header, index_col, copy)
+
+
+def _finish_single(result_df: pd.DataFrame, header: bool, index_col, copy: bool = False):
+    """对单个结果处理 header 与 index_col
+
+    result_df 可以是原表切片：copy=True 时在去掉表头行后只复制一次，
+    之后的列名、索引调整都作用在这份副本上，不会改动原表。
+    """
     # 处理header
-    if header and len(result_df) > 0:
-        # 将第一行作为列名
-        new_columns = result_df.iloc[0].tolist()
-        result_df = result_df.iloc[1:].copy()
+    start = 1 if header and len(result_df) > 0 else 0
+    if start:
+        # 将第一行作为列名（直接取底层数组建 Index，不经 Python 列表）
+        new_columns = pd.Index(result_df.iloc[0].to_numpy())
+    if start or copy:
+        result_df = _fast_iloc(result_df, start, len(result_df), 0, len(result_df.columns), copy=copy)
+    if start:
         result_df.columns = new_columns
         result_df.reset_index(drop=True, inplace=True)
     
     # 处理index_col
     if index_col is not None and len(result_df) > 0:
         if isinstance(index_col, str):
-            if index_col in result_df.columns:
+            # 直接交给 set_index 查找列名，缺失时由 KeyError 转为 ValueError
+            try:
                 result_df.set_index(index_col, inplace=True)
-            else:
+            except KeyError:
                 raise ValueError(f"列名 '{index_col}' 不存在")
         elif isinstance(index_col, int):
             if 0 <= index_col < len(result_df.columns):
@@ -98,65 +246,89 @@ def excel_range(
     return result_df
 
 
-def _parse_excel_range(df, range_str: str):
+def _stack_frames(all_dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    """纵向合并多个区域，结果使用默认 RangeIndex
+
+    各区域列名相同且为同一 numpy dtype 时直接拼接底层数组，
+    由 DataFrame 构造函数生成 RangeIndex，省去 concat 的索引重建与轴对齐；
+    否则回退到 pd.concat(ignore_index=True)。
+    """
+    columns = all_dfs[0].columns
+    dtypes = {dtype for part in all_dfs for dtype in part.dtypes}
+    if (len(dtypes) == 1 and isinstance(next(iter(dtypes)), np.dtype)
+            and all(part.columns.equals(columns) for part in all_dfs)):
+        stacked = np.concatenate([part.to_numpy() for part in all_dfs], axis=0)
+        return pd.DataFrame(stacked, columns=columns)
+    return pd.concat(all_dfs, ignore_index=True)
+
+
+def _parse_excel_range(df, range_str: str, copy: bool = True):
     """解析Excel区间字符串，如 'B2:D6' 或单个单元格 'B2'
     
     如果请求的区域超出 DataFrame 的实际范围，会自动裁剪到有效边界。
     """
-    if not OPENPYXL_AVAILABLE:
-        raise ImportError("需要安装 openpyxl 库来解析Excel区间")
-    
     try:
-        # 检查是否是单个单元格（不包含冒号）
-        if ':' not in range_str:
-            # 单个单元格，转换为范围格式 "B2:B2"
-            range_str = f"{range_str}:{range_str}"
-        
-        # 使用openpyxl解析区间
-        from openpyxl.utils import range_boundaries
-        min_col, min_row, max_col, max_row = range_boundaries(range_str)
-        
-        # 转换为pandas索引（从0开始）
-        start_row_idx = min_row - 1
-        end_row_idx = max_row - 1
-        start_col_idx = min_col - 1
-        end_col_idx = max_col - 1
-        
-        # 获取 DataFrame 的实际边界
-        df_max_row = len(df) - 1
-        df_max_col = len(df.columns) - 1
-        
-        # 检查起始位置是否完全超出范围
-        if start_row_idx > df_max_row or start_col_idx > df_max_col:
-            raise ValueError(f"起始位置超出范围: 请求行{min_row}列{min_col}，但DataFrame只有{len(df)}行{len(df.columns)}列")
-        
-        if start_row_idx < 0 or start_col_idx < 0:
-            raise ValueError(f"起始位置无效: 行{min_row}列{min_col}必须大于0")
-        
-        # 自动裁剪结束位置到有效范围
-        original_end_row = end_row_idx
-        original_end_col = end_col_idx
-        
-        end_row_idx = min(end_row_idx, df_max_row)
-        end_col_idx = min(end_col_idx, df_max_col)
-        
-        # 如果发生了裁剪，发出警告
-        if end_row_idx < original_end_row or end_col_idx < original_end_col:
-            warnings.warn(
-                f"请求的区域超出DataFrame范围，已自动裁剪: "
-                f"请求到第{max_row}行第{max_col}列，实际返回到第{end_row_idx+1}行第{end_col_idx+1}列",
-                UserWarning
-            )
-        
-        # 获取数据区间
-        # Excel区间是包含边界的，所以需要+1
-        range_df = df.iloc[start_row_idx:end_row_idx+1, start_col_idx:end_col_idx+1].copy()
-        return range_df
-        
+        return _slice_bounds(df, _range_bounds(range_str), range_str, copy=copy)
     except Exception as e:
         raise ValueError(f"无法解析Excel区间 '{range_str}': {e}")
 
 
+def _range_bounds(range_str: str):
+    """将Excel区间字符串解析为 Excel 1 基坐标 (min_row, max_row, min_col, max_col)"""
+    if not OPENPYXL_AVAILABLE:
+        raise ImportError("需要安装 openpyxl 库来解析Excel区间")
+    
+    # 检查是否是单个单元格（不包含冒号）
+    if ':' not in range_str:
+        # 单个单元格，转换为范围格式 "B2:B2"
+        range_str = f"{range_str}:{range_str}"
+    
+    # 使用openpyxl解析区间
+    min_col, min_row, max_col, max_row = _cached_range_boundaries(range_str)
+    return min_row, max_row, min_col, max_col
+
+
+def _slice_bounds(df, bounds, range_str: str, copy: bool = True):
+    """按解析好的区间坐标在 df 上取数，超出范围时自动裁剪结束位置"""
+    min_row, max_row, min_col, max_col = bounds
+    
+    # 转换为pandas索引（从0开始）
+    start_row_idx = min_row - 1
+    end_row_idx = max_row - 1
+    start_col_idx = min_col - 1
+    end_col_idx = max_col - 1
+    
+    # 获取 DataFrame 的实际边界
+    df_max_row = len(df) - 1
+    df_max_col = len(df.columns) - 1
+    
+    # 检查起始位置是否完全超出范围
+    if start_row_idx > df_max_row or start_col_idx > df_max_col:
+        raise ValueError(f"起始位置超出范围: 请求行{min_row}列{min_col}，但DataFrame只有{len(df)}行{len(df.columns)}列")
+    
+    if start_row_idx < 0 or start_col_idx < 0:
+        raise ValueError(f"起始位置无效: 行{min_row}列{min_col}必须大于0")
+    
+    # 自动裁剪结束位置到有效范围
+    original_end_row = end_row_idx
+    original_end_col = end_col_idx
+    
+    end_row_idx = min(end_row_idx, df_max_row)
+    end_col_idx = min(end_col_idx, df_max_col)
+    
+    # 如果发生了裁剪，发出警告
+    if end_row_idx < original_end_row or end_col_idx < original_end_col:
+        warnings.warn(
+            f"请求的区域超出DataFrame范围，已自动裁剪: "
+            f"请求到第{max_row}行第{max_col}列，实际返回到第{end_row_idx+1}行第{end_col_idx+1}列",
+            UserWarning
+        )
+    
+    # 获取数据区间
+    # Excel区间是包含边界的，所以需要+1
+    return _fast_iloc(df, start_row_idx, end_row_idx+1, start_col_idx, end_col_idx+1, copy=copy)
+
+
 def offset_range(
     df,
     start_row: int,
@@ -170,6 +342,7 @@ def offset_range(
     offset_start_col: Optional[int] = None,
     offset_end_col: Optional[int] = None,
     clip_to_bounds: bool = False,
+    copy: bool = True,
 ):
     """
     基于Excel行列坐标和偏移量获取数据区间，支持统一偏移和分别偏移两种模式
@@ -186,6 +359,7 @@ def offset_range(
       - offset_start_col: 起始列偏移量（分别偏移模式）
       - offset_end_col: 结束列偏移量（分别偏移模式）
       - clip_to_bounds: 是否自动裁剪到有效范围
+      - copy: 是否返回独立副本（默认 True，语义同 excel_range）
     
     返回：
       - DataFrame: 偏移后的数据区间
@@ -221,10 +395,10 @@ def offset_range(
         # 自动裁剪到有效范围
         max_row = len(df)
         max_col = len(df.columns)
-        new_start_row = max(1, min(new_start_row, max_row))
-        new_end_row = max(1, min(new_end_row, max_row))
-        new_start_col = max(1, min(new_start_col, max_col))
-        new_end_col = max(1, min(new_end_col, max_col))
+        new_start_row = _clamp(new_start_row, 1, max_row)
+        new_end_row = _clamp(new_end_row, 1, max_row)
+        new_start_col = _clamp(new_start_col, 1, max_col)
+        new_end_col = _clamp(new_end_col, 1, max_col)
         
         # 检查区间是否有效
         if new_start_row > new_end_row or new_start_col > new_end_col:
@@ -244,11 +418,22 @@ def offset_range(
     end_col_idx = new_end_col - 1
     
     # 获取偏移后的数据区间
-    result_df = df.iloc[start_row_idx:end_row_idx+1, start_col_idx:end_col_idx+1].copy()
+    result_df = _fast_iloc(df, start_row_idx, end_row_idx+1, start_col_idx, end_col_idx+1, copy=copy)
     
     return result_df
 
 
+def _to_zero_based(v: int, upper: int, clip: bool) -> int:
+    """1 基整数转 0 基索引：clip 时裁剪到 [1, upper]，否则越界报错"""
+    v1 = int(v)
+    if clip:
+        v1 = _clamp(v1, 1, upper)
+    else:
+        if v1 < 1 or v1 > upper:
+            raise ValueError(f"索引 {v1} 超出范围 [1, {upper}]")
+    return v1 - 1
+
+
 def select_range(
     df,
     *,
@@ -266,6 +451,7 @@ def select_range(
     offset_end_row: Optional[int] = None,
     offset_start_col: Optional[int] = None,
     offset_end_col: Optional[int] = None,
+    copy: bool = True,
 ):
     """
     DSL风格的区间选择，优雅表达混合场景，最终构建 iloc 切片。
@@ -288,6 +474,7 @@ def select_range(
       - 未指定的边界使用默认：start_row=1, start_col=1, end_row=末行, end_col=末列。
         因此通常无需显式写 'end'：例如仅给出 `start='B2'` 即表示从 B2 一直到表尾；
         仅给 `start_row` 或 `start_col` 也分别表示到末行或末列。
+      - copy 默认 True 返回独立副本；copy=False 返回与原表共享内存的切片，语义同 excel_range。
 
     例：
       df.select_range(start='B2')                       # 从 B2 到末行末列
@@ -298,30 +485,45 @@ def select_range(
     num_rows = len(df)
     num_cols = len(df.columns)
 
-    def is_cell_str(s: str) -> bool:
-        return isinstance(s, str) and any(c.isdigit() for c in s) and any(c.isalpha() for c in s)
-
-    def excel_col_to_idx(col_label: str) -> int:
-        # A→1, B→2 ... 转 1 基
-        col_label = col_label.strip().upper()
-        val = 0
-        for ch in col_label:
-            if not ('A' <= ch <= 'Z'):
-                raise ValueError(f"无效的列标记: {col_label}")
-            val = val * 26 + (ord(ch) - ord('A') + 1)
-        return val
+    # 快速路径：四个边界都只是整数（或未给出）时直接换算，跳过规格解析
+    if start is None and end is None and all(
+            v is None or isinstance(v, int) for v in (start_row, end_row, start_col, end_col)):
+        row_start_idx = None if start_row is None else _to_zero_based(start_row, num_rows, clip)
+        col_start_idx = None if start_col is None else _to_zero_based(start_col, num_cols, clip)
+        row_end_idx = None if end_row is None else _to_zero_based(end_row, num_rows, clip)
+        col_end_idx = None if end_col is None else _to_zero_based(end_col, num_cols, clip)
+        return _select_by_idx(
+            df, num_rows, num_cols, row_start_idx, row_end_idx, col_start_idx, col_end_idx,
+            clip, offset_rows, offset_cols,
+            offset_start_row, offset_end_row, offset_start_col, offset_end_col, copy,
+        )
 
     def normalize_1based_idx(v: int, upper: int, default_end: bool = False) -> int:
         # 输入 1 基整数，返回 0 基索引（限定边界；default_end 为 True 表示默认末端）
         if v is None:
             return (upper - 1) if default_end else 0
-        v1 = int(v)
-        if clip:
-            v1 = max(1, min(v1, upper))
+        return _to_zero_based(v, upper, clip)
+
+    # 同一次调用内，对同一列/行的多次子串/正则查找共用一次字符串转换结果；
+    # 等值查找直接分块扫描、命中即停（整列 factorize 建索引反而慢得多）
+    str_cache: Dict[tuple, pd.Series] = {}
+
+    def find_pos(target, q, opts: dict, axis: str) -> Optional[int]:
+        mode = opts.get("mode", "exact")
+        nth = _norm_nth(opts.get("nth", 1))
+        if mode in ("contains", "regex"):
+            key = (axis, target)
+            data = str_cache.get(key)
+            if data is None:
+                data = str_cache[key] = _as_string(_resolve_target(df, target, axis))
+            pos = find_idx_series(data, q, mode=mode, na=opts.get("na", False), flags=opts.get("flags", 0), nth=nth)
         else:
-            if v1 < 1 or v1 > upper:
-                raise ValueError(f"索引 {v1} 超出范围 [1, {upper}]")
-        return v1 - 1  # 转 0 基
+            na = opts.get("na", False)
+            flags = opts.get("flags", 0)
+            pos = find_idx_dataframe(df, target, q, mode=mode, na=na, flags=flags, nth=nth, axis=axis)
+        if isinstance(pos, np.ndarray):
+            pos = int(pos[0]) if pos.size > 0 else -1
+        return None if pos is None or pos < 0 else int(pos)
 
     def parse_row_spec(spec, default_end: bool = False) -> Optional[int]:
         if spec is None:
@@ -329,12 +531,12 @@ def select_range(
         if isinstance(spec, int):
             return normalize_1based_idx(spec, num_rows, default_end)
         if isinstance(spec, str):
-            if is_cell_str(spec):
+            if _is_cell_str(spec):
                 # 解析单元格字符串，如 "A2"
                 if not OPENPYXL_AVAILABLE:
                     raise ImportError("需要安装 openpyxl 库来解析单元格字符串")
                 try:
-                    col, row = coordinate_to_tuple(spec)
+                    col, row = _cached_coord_to_tuple(spec)
                     return normalize_1based_idx(row, num_rows, default_end)
                 except Exception as e:
                     raise ValueError(f"无法解析单元格字符串 '{spec}': {e}")
@@ -349,23 +551,13 @@ def select_range(
                 if not OPENPYXL_AVAILABLE:
                     raise ImportError("需要安装 openpyxl 库来解析单元格字符串")
                 try:
-                    col, row = coordinate_to_tuple(spec[1])
+                    col, row = _cached_coord_to_tuple(spec[1])
                     return normalize_1based_idx(row, num_rows, default_end)
                 except Exception as e:
                     raise ValueError(f"无法解析单元格字符串 '{spec[1]}': {e}")
             elif spec_type == "find-row":
-                # 需要调用 find_idx 方法
-                from ..data.search import find_idx_dataframe
-                target, q = spec[1], spec[2]
                 opts = spec[3] if len(spec) > 3 else {}
-                mode = opts.get("mode", "exact")
-                na = opts.get("na", False)
-                flags = opts.get("flags", 0)
-                nth = opts.get("nth", 1)
-                pos = find_idx_dataframe(df, target, q, mode=mode, na=na, flags=flags, nth=nth, axis="column")
-                if isinstance(pos, np.ndarray):
-                    pos = int(pos[0]) if pos.size > 0 else -1
-                return None if pos is None or pos < 0 else int(pos)
+                return find_pos(spec[1], spec[2], opts, axis="column")
         raise ValueError(f"不支持的行规格: {spec}")
 
     def parse_col_spec(spec, default_end: bool = False) -> Optional[int]:
@@ -374,25 +566,25 @@ def select_range(
         if isinstance(spec, int):
             return normalize_1based_idx(spec, num_cols, default_end)
         if isinstance(spec, str):
-            if is_cell_str(spec):
+            if _is_cell_str(spec):
                 # 解析单元格字符串，如 "A2"
                 if not OPENPYXL_AVAILABLE:
                     raise ImportError("需要安装 openpyxl 库来解析单元格字符串")
                 try:
-                    col, row = coordinate_to_tuple(spec)
+                    col, row = _cached_coord_to_tuple(spec)
                     return normalize_1based_idx(col, num_cols, default_end)
                 except Exception as e:
                     raise ValueError(f"无法解析单元格字符串 '{spec}': {e}")
             else:
                 # 列字母，如 "F", "AA"
-                col_idx = excel_col_to_idx(spec)
+                col_idx = _excel_col_to_idx(spec)
                 return normalize_1based_idx(col_idx, num_cols, default_end)
         if isinstance(spec, (tuple, list)) and len(spec) >= 2:
             spec_type = spec[0]
             if spec_type == "col":
                 col_val = spec[1]
                 if isinstance(col_val, str):
-                    col_idx = excel_col_to_idx(col_val)
+                    col_idx = _excel_col_to_idx(col_val)
                 else:
                     col_idx = col_val
                 return normalize_1based_idx(col_idx, num_cols, default_end)
@@ -400,23 +592,13 @@ def select_range(
                 if not OPENPYXL_AVAILABLE:
                     raise ImportError("需要安装 openpyxl 库来解析单元格字符串")
                 try:
-                    col, row = coordinate_to_tuple(spec[1])
+                    col, row = _cached_coord_to_tuple(spec[1])
                     return normalize_1based_idx(col, num_cols, default_end)
                 except Exception as e:
                     raise ValueError(f"无法解析单元格字符串 '{spec[1]}': {e}")
             elif spec_type == "find-col":
-                # 需要调用 find_idx 方法
-                from ..data.search import find_idx_dataframe
-                target, q = spec[1], spec[2]
                 opts = spec[3] if len(spec) > 3 else {}
-                mode = opts.get("mode", "exact")
-                na = opts.get("na", False)
-                flags = opts.get("flags", 0)
-                nth = opts.get("nth", 1)
-                pos = find_idx_dataframe(df, target, q, mode=mode, na=na, flags=flags, nth=nth, axis="row")
-                if isinstance(pos, np.ndarray):
-                    pos = int(pos[0]) if pos.size > 0 else -1
-                return None if pos is None or pos < 0 else int(pos)
+                return find_pos(spec[1], spec[2], opts, axis="row")
         raise ValueError(f"不支持的列规格: {spec}")
 
     # 解析 start/end
@@ -424,11 +606,11 @@ def select_range(
     end_r_from_end = end_c_from_end = None
 
     if start is not None:
-        if isinstance(start, str) and is_cell_str(start):
+        if _is_cell_str(start):
             if not OPENPYXL_AVAILABLE:
                 raise ImportError("需要安装 openpyxl 库来解析单元格字符串")
             try:
-                col, row = coordinate_to_tuple(start)
+                col, row = _cached_coord_to_tuple(start)
                 start_r_from_start = normalize_1based_idx(row, num_rows)
                 start_c_from_start = normalize_1based_idx(col, num_cols)
             except Exception as e:
@@ -437,11 +619,11 @@ def select_range(
             raise ValueError(f"start 参数必须是单元格字符串，如 'A2'，当前为: {start}")
 
     if end is not None:
-        if isinstance(end, str) and is_cell_str(end):
+        if _is_cell_str(end):
             if not OPENPYXL_AVAILABLE:
                 raise ImportError("需要安装 openpyxl 库来解析单元格字符串")
             try:
-                col, row = coordinate_to_tuple(end)
+                col, row = _cached_coord_to_tuple(end)
                 end_r_from_end = normalize_1based_idx(row, num_rows, default_end=True)
                 end_c_from_end = normalize_1based_idx(col, num_cols, default_end=True)
             except Exception as e:
@@ -455,6 +637,21 @@ def select_range(
     row_end_idx = parse_row_spec(end_row, default_end=True) if end_row is not None else end_r_from_end
     col_end_idx = parse_col_spec(end_col, default_end=True) if end_col is not None else end_c_from_end
 
+    return _select_by_idx(
+        df, num_rows, num_cols, row_start_idx, row_end_idx, col_start_idx, col_end_idx,
+        clip, offset_rows, offset_cols,
+        offset_start_row, offset_end_row, offset_start_col, offset_end_col, copy,
+    )
+
+
+def _select_by_idx(df, num_rows: int, num_cols: int,
+                   row_start_idx: Optional[int], row_end_idx: Optional[int],
+                   col_start_idx: Optional[int], col_end_idx: Optional[int],
+                   clip: bool, offset_rows: int, offset_cols: int,
+                   offset_start_row: Optional[int], offset_end_row: Optional[int],
+                   offset_start_col: Optional[int], offset_end_col: Optional[int],
+                   copy: bool):
+    """select_range 的收尾：对已解析的 0 基边界应用偏移、边界处理后切片（None 表示未指定）"""
     # 应用偏移
     if any(x is not None for x in [offset_start_row, offset_end_row, offset_start_col, offset_end_col]):
         # 分别偏移模式
@@ -479,10 +676,10 @@ def select_range(
 
     # 边界处理
     if clip:
-        row_start_idx = max(0, min(row_start_idx or 0, num_rows - 1))
-        row_end_idx = max(0, min(row_end_idx or (num_rows - 1), num_rows - 1))
-        col_start_idx = max(0, min(col_start_idx or 0, num_cols - 1))
-        col_end_idx = max(0, min(col_end_idx or (num_cols - 1), num_cols - 1))
+        row_start_idx = _clamp(row_start_idx or 0, 0, num_rows - 1)
+        row_end_idx = _clamp(row_end_idx or (num_rows - 1), 0, num_rows - 1)
+        col_start_idx = _clamp(col_start_idx or 0, 0, num_cols - 1)
+        col_end_idx = _clamp(col_end_idx or (num_cols - 1), 0, num_cols - 1)
     else:
         if row_start_idx is not None and (row_start_idx < 0 or row_start_idx >= num_rows):
             raise ValueError(f"起始行索引 {row_start_idx} 超出范围 [0, {num_rows-1}]")
@@ -499,8 +696,10 @@ def select_range(
     if col_start_idx is not None and col_end_idx is not None and col_start_idx > col_end_idx:
         col_start_idx, col_end_idx = col_end_idx, col_start_idx
 
-    # 构建切片
-    row_slice = slice(row_start_idx, (row_end_idx + 1) if row_end_idx is not None else None)
-    col_slice = slice(col_start_idx, (col_end_idx + 1) if col_end_idx is not None else None)
+    # 构建切片（0 基半开区间）
+    r0 = row_start_idx if row_start_idx is not None else 0
+    r1 = (row_end_idx + 1) if row_end_idx is not None else num_rows
+    c0 = col_start_idx if col_start_idx is not None else 0
+    c1 = (col_end_idx + 1) if col_end_idx is not None else num_cols
 
-    return df.iloc[row_slice, col_slice].copy()
+    return _fast_iloc(df, r0, r1, c0, c1, copy=copy)
@@ -4,16 +4,60 @@ Excel 读取模块
 提供Excel文件范围读取功能
 """
 
+from functools import lru_cache
+import inspect
+import os
+
 import pandas as pd
 import numpy as np
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
 from typing import Any, Optional, Union, List, Dict, Tuple
 import warnings
 
+# 工作表原始行缓存：(绝对路径, 工作表, 引擎) -> ((mtime_ns, size), 行数据, 各行有效宽度, 已读行数上限/None 为整表)
+_SHEET_CACHE_SIZE = 8
+_sheet_cache: Dict[tuple, tuple] = {}
+
+
+def _resolve_engine(engine: str) -> str:
+    """calamine 不可用（未安装 python-calamine 或 pandas 版本过旧）时回退到 openpyxl"""
+    if engine != 'calamine':
+        return engine
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return 'openpyxl'
+    # pandas 2.2 起才内置 calamine 引擎
+    if 'calamine' not in getattr(pd.ExcelFile, '_engines', {}):
+        return 'openpyxl'
+    return engine
+
+
+@lru_cache(maxsize=None)
+def _sheet_reader_supported(engine: str) -> bool:
+    """pandas 内部读取器是否提供 _load_sheet_rows 依赖的接口
+
+    这些是 pandas 的私有接口，按特性而非版本号检测：需要 get_sheet_by_name/get_sheet_by_index
+    与带 file_rows_needed 参数的 get_sheet_data；不满足时 read_excel_range 改用 ExcelFile.parse。
+    """
+    reader_cls = getattr(pd.ExcelFile, '_engines', {}).get(engine)
+    if reader_cls is None:
+        return False
+    if not all(callable(getattr(reader_cls, name, None))
+               for name in ('get_sheet_by_name', 'get_sheet_by_index', 'get_sheet_data')):
+        return False
+    try:
+        params = inspect.signature(reader_cls.get_sheet_data).parameters
+    except (TypeError, ValueError):
+        return False
+    return 'file_rows_needed' in params
+
 
 def read_excel_range(file_path: str, 
                      sheet_name: Union[str, int] = 0,
                      ranges: Optional[Union[str, List[str]]] = None,
-                     engine: str = 'openpyxl',
+                     engine: str = 'calamine',
                      merge_ranges: bool = False,
                      **kwargs) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
     """
@@ -23,7 +67,7 @@ def read_excel_range(file_path: str,
     file_path: Excel文件路径
     sheet_name: 工作表名称或索引，默认为0（第一个工作表）
     ranges: 单个范围字符串或范围列表，如 "A1:C10" 或 ["A1:C10", "E1:G10"]
-    engine: 读取引擎，默认 'openpyxl'，也可用 'calamine' 等
+    engine: 读取引擎，默认 'calamine'（Rust 实现，读取更快；未安装 python-calamine 时自动回退到 'openpyxl'）
     merge_ranges: 是否纵向合并多个范围，默认False返回字典
     **kwargs: 传递给 pd.read_excel 的其他参数
     
@@ -48,6 +92,8 @@ def read_excel_range(file_path: str,
         >>> df = xlgrab.read_excel_range("data.xlsx", sheet_name="Sheet1", ranges="A1:C10")
     """
     
+    engine = _resolve_engine(engine)
+    
     # 如果没有指定范围，使用标准 read_excel
     if ranges is None:
         return pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, **kwargs)
@@ -58,11 +104,12 @@ def read_excel_range(file_path: str,
     # 解析范围函数（使用 openpyxl.utils）
     def parse_range(cell_range: str) -> Dict:
         """解析单元格范围，如 A1:C10"""
-        from openpyxl.utils import range_boundaries, get_column_letter
+        from openpyxl.utils import get_column_letter
+        from .range import _cached_range_boundaries
         
         try:
-            # range_boundaries 返回 (min_col, min_row, max_col, max_row)
-            min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+            # range_boundaries 返回 (min_col, min_row, max_col, max_row)，结果经缓存复用
+            min_col, min_row, max_col, max_row = _cached_range_boundaries(cell_range)
             
             # 转换列索引为列字母
             start_col = get_column_letter(min_col)
@@ -73,6 +120,8 @@ def read_excel_range(file_path: str,
                 'end_col': end_col,
                 'start_row': min_row,
                 'end_row': max_row,
+                'min_col': min_col,
+                'max_col': max_col,
                 'usecols': f"{start_col}:{end_col}",
                 'skiprows': min_row - 1,
                 'nrows': max_row - min_row + 1
@@ -80,39 +129,156 @@ def read_excel_range(file_path: str,
         except Exception as e:
             raise ValueError(f"无效的范围格式 '{cell_range}': {e}")
     
-    # 读取每个范围的数据
     range_data = {}
     
-    for cell_range in range_list:
+    # 本地文件且无额外解析参数时：工作表只读取到各范围所需的最后一行并缓存，各范围直接从缓存行切片，
+    # 同一文件未修改时多次调用也不再重复读取
+    # sheet_name 为 None 或列表时 read_excel 返回 {工作表: DataFrame}，交给下面的 ExcelFile 路径处理
+    if not kwargs and engine in ('openpyxl', 'calamine') and _sheet_reader_supported(engine) \
+            and isinstance(sheet_name, (str, int)) \
+            and isinstance(file_path, (str, os.PathLike)) and os.path.isfile(file_path):
+        range_infos = {}
+        for cell_range in range_list:
+            try:
+                range_infos[cell_range] = parse_range(cell_range)
+            except Exception as e:
+                raise ValueError(f"读取范围 {cell_range} 失败: {e}")
+        # 与 read_excel 一致，header=None 时多读一行
+        rows_needed = max(info['end_row'] for info in range_infos.values()) + 1
         try:
-            range_info = parse_range(cell_range)
-            
-            # 读取指定范围的数据
-            df_range = pd.read_excel(
-                file_path,
-                sheet_name=sheet_name,
-                engine=engine,
-                header=None,
-                usecols=range_info['usecols'],
-                skiprows=range_info['skiprows'],
-                nrows=range_info['nrows'],
-                **kwargs
-            )
-            
-            range_data[cell_range] = df_range
-            
+            rows, widths = _load_sheet_rows(file_path, sheet_name, engine, rows_needed)
         except Exception as e:
-            raise ValueError(f"读取范围 {cell_range} 失败: {e}")
+            raise ValueError(f"读取范围 {range_list[0]} 失败: {e}")
+        for cell_range in range_list:
+            try:
+                range_data[cell_range] = _slice_sheet_rows(rows, widths, range_infos[cell_range], engine, sheet_name)
+            except Exception as e:
+                raise ValueError(f"读取范围 {cell_range} 失败: {e}")
+        return _combine_ranges(range_list, range_data, merge_ranges)
+    
+    # 读取每个范围的数据：工作簿只打开一次，各范围在同一 ExcelFile 上解析，
+    # 避免每个范围都重新加载整个文件（共享字符串、样式等）
+    # storage_options / engine_kwargs 属于打开文件的参数，其余参数传给每次解析
+    open_kwargs = {key: kwargs.pop(key) for key in ('storage_options', 'engine_kwargs') if key in kwargs}
+    # 默认不把首行当表头；调用方显式传入的 header 等参数优先
+    parse_kwargs = {'header': None, **kwargs}
+    
+    try:
+        xls = pd.ExcelFile(file_path, engine=engine, **open_kwargs)
+    except Exception as e:
+        # 与逐个读取时一致：打开失败即第一个范围读取失败
+        raise ValueError(f"读取范围 {range_list[0]} 失败: {e}")
     
-    # 返回结果
+    with xls:
+        for cell_range in range_list:
+            try:
+                range_info = parse_range(cell_range)
+                
+                # 读取指定范围的数据
+                df_range = xls.parse(
+                    sheet_name=sheet_name,
+                    usecols=range_info['usecols'],
+                    skiprows=range_info['skiprows'],
+                    nrows=range_info['nrows'],
+                    **parse_kwargs
+                )
+                
+                range_data[cell_range] = df_range
+                
+            except Exception as e:
+                raise ValueError(f"读取范围 {cell_range} 失败: {e}")
+    
+    return _combine_ranges(range_list, range_data, merge_ranges)
+
+
+def _combine_ranges(range_list: List[str], range_data: Dict[str, pd.DataFrame],
+                    merge_ranges: bool) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """按范围个数与 merge_ranges 组织返回结果"""
     if len(range_list) == 1:
         # 单个范围，直接返回 DataFrame
         return range_data[range_list[0]]
     elif merge_ranges:
-        # 多个范围，纵向合并
-        dfs = list(range_data.values())
-        merged_df = pd.concat(dfs, axis=0, ignore_index=True)
-        return merged_df
+        # 多个范围，纵向合并（列与 dtype 一致时直接拼接底层数组）
+        from .range import _stack_frames
+        return _stack_frames(list(range_data.values()))
     else:
         # 多个范围，返回字典
         return range_data
+
+
+def _load_sheet_rows(file_path, sheet_name: Union[str, int], engine: str,
+                     rows_needed: Optional[int] = None) -> Tuple[list, np.ndarray]:
+    """读取工作表前 rows_needed 行（None 为整表）的原始行数据（与 pandas 解析前的数据一致）
+
+    已缓存的行足够时直接复用；文件修改时间或大小变化时重新读取。
+    """
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = (path, sheet_name, engine)
+    hit = _sheet_cache.get(key)
+    if hit is not None and hit[0] == stamp:
+        if hit[3] is None or (rows_needed is not None and rows_needed <= hit[3]):
+            return hit[1], hit[2]
+        # 缓存的部分行不够用时改读整表，避免范围逐次下移时反复重读
+        rows_needed = None
+    
+    with pd.ExcelFile(path, engine=engine) as xls:
+        reader = xls._reader
+        if isinstance(sheet_name, str):
+            sheet = reader.get_sheet_by_name(sheet_name)
+        else:
+            sheet = reader.get_sheet_by_index(sheet_name)
+        if rows_needed is None:
+            rows = reader.get_sheet_data(sheet)
+        else:
+            # 只读到所需的行为止（openpyxl 只读模式与 calamine 都会提前停止）
+            rows = reader.get_sheet_data(sheet, file_rows_needed=rows_needed)
+    
+    # 各行去掉末尾空单元格后的宽度，用于按范围还原 openpyxl 读取时的行列裁剪
+    widths = np.zeros(len(rows), dtype=np.int64)
+    for i, row in enumerate(rows):
+        n = len(row)
+        while n and row[n - 1] == "":
+            n -= 1
+        widths[i] = n
+    
+    _sheet_cache.pop(key, None)
+    if len(_sheet_cache) >= _SHEET_CACHE_SIZE:
+        _sheet_cache.pop(next(iter(_sheet_cache)))
+    _sheet_cache[key] = (stamp, rows, widths, rows_needed)
+    return rows, widths
+
+
+def _slice_sheet_rows(rows: list, widths: np.ndarray, range_info: Dict, engine: str,
+                      sheet_name: Union[str, int]) -> pd.DataFrame:
+    """从缓存的整表行数据中切出范围，结果与 read_excel(usecols, skiprows, nrows) 相同（解析时复制行，缓存不被修改）"""
+    skip, end = range_info['skiprows'], range_info['end_row']
+    # read_excel 在 header=None 时会多读一行（skiprows + nrows + 1），裁剪与补齐以这些行为准
+    stop = end + 1
+    if engine == 'openpyxl':
+        # openpyxl 只读到所需行，并裁掉其中末尾的空行、按剩余行的最大宽度补齐
+        filled = np.flatnonzero(widths[:stop])
+        if filled.size == 0:
+            return pd.DataFrame()
+        stop = int(filled[-1]) + 1
+        width = int(widths[:stop].max())
+        block = [row[:width] for row in rows[skip:min(stop, end)]]
+    else:
+        if not rows[:stop]:
+            return pd.DataFrame()
+        block = [row[:] for row in rows[skip:end]]
+    
+    try:
+        parser = TextParser(
+            block,
+            header=None,
+            skip_blank_lines=False,
+            usecols=list(range(range_info['min_col'] - 1, range_info['max_col'])),
+        )
+        return parser.read()
+    except EmptyDataError:
+        return pd.DataFrame()
+    except Exception as err:
+        err.args = (f"{err.args[0]} (sheet: {sheet_name})", *err.args[1:])
+        raise err
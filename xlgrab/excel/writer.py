@@ -1,36 +1,114 @@
 """
 Excel 写入模块
 
-提供向现有Excel文件高效写入数据的功能。对外暴露三个核心函数：
+提供向现有Excel文件高效写入数据的功能。对外暴露四个核心函数：
 - to_sheet_many: (推荐) 自动分批写入多个任务，性能最高。
+- excel_writer: 上下文管理器，文件只打开、保存一次，期间可多次写入。
 - write_to_excel: 写入单个DataFrame。
 - write_range_to_excel: 写入二维列表或元组。
 """
 
+from concurrent.futures import ProcessPoolExecutor
+import datetime
 from itertools import groupby
-from operator import itemgetter
+from operator import attrgetter, itemgetter
+import os
+import shutil
+import tempfile
 from typing import Any, Dict, List, Literal, Optional, Union
 import warnings
+import weakref
 
+import numpy as np
 import openpyxl
+from openpyxl.cell.cell import Cell, TIME_FORMATS
 import pandas as pd
 
+# xlsxwriter 可选：新建文件时用于流式写出，未安装时统一走 openpyxl
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+# 与 openpyxl 写入一致：不把字符串转为数字或超链接。NaN/±inf 在写出时留空（openpyxl 将其写为空的数值单元格），
+# nan_inf_to_errors 只是兜底，避免漏网的非有限值让 xlsxwriter 直接报错
+_XLSXWRITER_OPTIONS = {'constant_memory': True, 'strings_to_numbers': False, 'strings_to_urls': False,
+                       'nan_inf_to_errors': True}
+_INF = float('inf')
+# 日期时间类型按 openpyxl 的默认数字格式写出（datetime 须排在 date 之前）
+_DATE_TYPES = (datetime.datetime, datetime.date, datetime.time, datetime.timedelta)
+
+def _read_umask() -> int:
+    """读取进程 umask：os.umask 只能先设置再恢复，仅在导入时调用一次，避免保存时与其他线程创建文件竞争"""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+# 新建文件的权限，与 open() 新建文件时一致（0o666 去掉 umask）
+_NEW_FILE_MODE = 0o666 & ~_read_umask()
+
+# 流式写出（xlsxwriter / write_only）时每次转换的行数，避免整表物化为 object 数组
+_STREAM_CHUNK_ROWS = 1000
+
+# write_to_excel(reuse_workbook=True) 最近保存的工作簿：绝对路径 -> ((inode, mtime_ns, size), workbook)
+# 文件保存后未被外部修改时，下一次 reuse_workbook=True 的写入直接复用，省去重新解析整个文件；
+# 含图片/图表的工作簿不缓存（openpyxl 保存后图片数据流已关闭，无法再次保存），可用 clear_workbook_cache() 清空
+_WORKBOOK_CACHE_SIZE = 2
+_workbook_cache: Dict[str, tuple] = {}
+
+# 每张工作表的合并单元格索引（按起始行排序），同一工作簿多次写入时复用
+_merge_index: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
 # ====================================================================
 # Public API
 # ====================================================================
 
 MergePolicy = Literal["unmerge", "error"]
 
-def to_sheet_many(tasks: List[Dict[str, Any]]) -> None:
+def to_sheet_many(tasks: List[Dict[str, Any]], parallel: bool = False) -> None:
     """
     自动按文件名分批，向多个Excel文件高效写入数据。
+
+    parallel: 涉及多个文件时是否用多进程并行写入（各文件相互独立），默认False。
+              进程启动与 DataFrame 传输有固定开销，适合文件多、单个文件写入量大的场景；
+              在 Windows 等 spawn 启动方式下需将调用放在 `if __name__ == "__main__":` 中
     """
     sorted_tasks = sorted(tasks, key=itemgetter('excel_name'))
-    for excel_name, group in groupby(sorted_tasks, key=itemgetter('excel_name')):
-        with _ExcelBatchWriter(str(excel_name)) as writer:
-            task_list = list(group)
-            write_tasks = [{k: v for k, v in task.items() if k != 'excel_name'} for task in task_list]
-            writer.write_many(write_tasks)
+    groups = [
+        (str(excel_name), [{k: v for k, v in task.items() if k != 'excel_name'} for task in group])
+        for excel_name, group in groupby(sorted_tasks, key=itemgetter('excel_name'))
+    ]
+    if parallel and len(groups) > 1:
+        max_workers = min(len(groups), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_write_one_file, excel_name, write_tasks) for excel_name, write_tasks in groups]
+            for future in futures:
+                future.result()
+    else:
+        for excel_name, write_tasks in groups:
+            _write_one_file(excel_name, write_tasks)
+
+def clear_workbook_cache() -> None:
+    """
+    清空 write_to_excel(reuse_workbook=True) 缓存的已保存工作簿。
+
+    缓存按文件 inode、修改时间与大小自动失效；在需要释放内存，或文件可能被原地以相同时间戳与大小改写时调用。
+    """
+    _workbook_cache.clear()
+
+def excel_writer(excel_name: str) -> "_ExcelBatchWriter":
+    """
+    打开（或新建）Excel文件供多次写入，退出 with 块时只保存一次。
+
+    示例:
+        >>> with xlgrab.excel_writer("report.xlsx") as writer:
+        ...     writer.write(df=df1, sheet_name="Report")
+        ...     writer.write(df=df2, sheet_name="Report", start_row=10)
+    """
+    if not isinstance(excel_name, str):
+        raise ValueError("excel_name参数必须是字符串")
+    return _ExcelBatchWriter(excel_name)
 
 def write_to_excel(df: pd.DataFrame,
                    excel_name: str,
@@ -44,21 +122,26 @@ def write_to_excel(df: pd.DataFrame,
                    index: bool = False,
                    merge_policy: MergePolicy = 'unmerge',
                    *,
+                   reuse_workbook: bool = False,
                    _workbook: Optional[openpyxl.Workbook] = None,
                    _save: bool = True) -> None:
     """
     向现有Excel文件的指定位置写入DataFrame数据。
+
+    reuse_workbook=True 时保存后在内存中保留该工作簿，下一次同样传入 reuse_workbook=True 写入同一文件、
+    且文件未被改动（inode、修改时间与大小均不变）时直接复用，省去重新解析；默认不保留。
     """
     if not isinstance(df, pd.DataFrame):
         raise ValueError("df参数必须是pandas DataFrame")
     if not isinstance(excel_name, str):
         raise ValueError("excel_name参数必须是字符串")
+    _check_writable_format(excel_name)
     if start_row < 1 or start_col < 1:
         raise ValueError("start_row/start_col必须大于等于1")
 
     _perform_write(
         df, excel_name, sheet_name, start_row, start_col,
-        end_row, end_col, overwrite, header, index, merge_policy, _workbook, _save
+        end_row, end_col, overwrite, header, index, merge_policy, reuse_workbook, _workbook, _save
     )
 
 def write_range_to_excel(data: Union[pd.DataFrame, list, tuple],
@@ -95,11 +178,24 @@ def write_range_to_excel(data: Union[pd.DataFrame, list, tuple],
 # Internal Implementation
 # ====================================================================
 
+def _write_one_file(excel_name: str, write_tasks: List[Dict[str, Any]]) -> None:
+    """把同一文件的全部任务写入并保存一次；定义在模块顶层，以便提交到进程池执行"""
+    write_tasks = _coalesce_tasks(write_tasks)
+    # 新文件且各任务只需顺序追加时，使用 openpyxl 的 write_only 模式流式写出
+    write_only = not os.path.exists(excel_name) and _is_append_only(write_tasks)
+    with _ExcelBatchWriter(excel_name, write_only=write_only) as writer:
+        writer.write_many(write_tasks)
+
 class _ExcelBatchWriter:
-    """内部类：一次打开、多次写、一次保存。"""
-    def __init__(self, excel_name: str):
+    """内部类：一次打开、多次写、一次保存。
+
+    write_only=True 时新建 openpyxl 的 write_only 工作簿，只能按行顺序追加，
+    调用方需保证各任务在同一工作表上行号递增（见 _is_append_only）。
+    """
+    def __init__(self, excel_name: str, write_only: bool = False):
+        _check_writable_format(excel_name)
         self.excel_name = excel_name
-        self.workbook = _open_or_create_workbook(excel_name)
+        self.workbook = openpyxl.Workbook(write_only=True) if write_only else _open_or_create_workbook(excel_name)
 
     def write(self, **kwargs) -> None:
         write_to_excel(excel_name=self.excel_name, _workbook=self.workbook, _save=False, **kwargs)
@@ -109,7 +205,7 @@ class _ExcelBatchWriter:
             self.write(**task)
 
     def save(self) -> None:
-        self.workbook.save(self.excel_name)
+        _atomic_save(self.workbook.save, self.excel_name)
 
     def __enter__(self):
         return self
@@ -119,54 +215,261 @@ class _ExcelBatchWriter:
 
 def _perform_write(df: pd.DataFrame, excel_name: str, sheet_name: Union[str, int], start_row: int, start_col: int,
                    end_row: Optional[int], end_col: Optional[int], overwrite: bool, header: bool, index: bool,
-                   merge_policy: MergePolicy, _workbook: Optional[openpyxl.Workbook], _save: bool) -> None:
+                   merge_policy: MergePolicy, reuse_workbook: bool, _workbook: Optional[openpyxl.Workbook],
+                   _save: bool) -> None:
     """包含所有写入逻辑的内部函数。"""
-    # 1. 准备写入数据，并确定最终写入的行数和列数
-    data_to_write = df.values.tolist()
-    if header and not df.empty:
-        col_names = [f"Column_{i}" for i in df.columns] if isinstance(df.columns, pd.RangeIndex) else df.columns.tolist()
-        data_to_write.insert(0, col_names)
-    if index and not df.empty:
-        row_names = [f"Row_{i}" for i in df.index] if isinstance(df.index, pd.RangeIndex) else df.index.tolist()
-        # 为 header 行的索引位置留空
-        if header: row_names.insert(0, None) 
-        for i, row in enumerate(data_to_write):
-            data_to_write[i].insert(0, row_names[i])
+    # 1. 确定最终写入的行数和列数
+    final_rows, final_cols = _write_block_shape(df, header, index)
 
-    final_rows = len(data_to_write)
-    final_cols = len(data_to_write[0]) if final_rows > 0 else 0
+    # 新文件且单次写入：用 xlsxwriter 直接流式写出，无需构建 openpyxl 工作簿
+    if _workbook is None and _save and XLSXWRITER_AVAILABLE and not os.path.exists(excel_name):
+        rows = _iter_write_rows(df, header, index)
+        _atomic_save(lambda path: _write_new_xlsxwriter(path, sheet_name, rows, start_row, start_col), excel_name)
+        return
 
     # 2. 确定最终写入区域，并处理合并单元格
     write_end_row = start_row + final_rows - 1
     write_end_col = start_col + final_cols - 1
 
-    wb = _workbook or _open_or_create_workbook(excel_name)
+    wb = _workbook or _take_cached_workbook(excel_name, reuse_workbook)
     ws = _get_or_create_worksheet(wb, sheet_name)
+    if wb.write_only:
+        # 新建的 write_only 工作表没有合并单元格，直接顺序追加
+        _append_block(ws, _iter_write_rows(df, header, index), start_row, start_col, final_rows)
+        return
+    if not (final_rows and final_cols):
+        # 空数据：只确保工作表存在（与写入后保存的结果一致），不处理合并单元格、不构建写入块
+        if _workbook is None and _save: _save_and_cache(wb, excel_name, reuse_workbook)
+        return
     _handle_merged_cells(ws, start_row, write_end_row, start_col, write_end_col, merge_policy)
 
+    data_to_write = _build_write_block(df, header, index)
+
     # 3. 写入数据 (注意：当前版本忽略了 end_row, end_col, overwrite 的截断逻辑，因为这与 unmerge 逻辑冲突)
     #    后续可以优化为先 unmerge，再根据截断后的尺寸写入
-    cell_set = ws.cell
+    _write_block(ws, data_to_write, start_row, start_col)
+
+    if _workbook is None and _save: _save_and_cache(wb, excel_name, reuse_workbook)
+
+def _build_write_block(df: pd.DataFrame, header: bool, index: bool) -> np.ndarray:
+    """按写入布局生成二维 object 数组：表头行、索引列与数据一次性放入预分配的数组"""
+    if df.empty:
+        return np.empty(df.shape, dtype=object)
+    h = 1 if header else 0
+    w = 1 if index else 0
+    out = np.empty((df.shape[0] + h, df.shape[1] + w), dtype=object)
+    out[h:, w:] = df.values
+    # 日期时间列整列转为 Python datetime/timedelta（全为日期列时 df.values 是 datetime64，
+    # 放入 object 数组会变成纳秒整数），带时区的按当地时间去掉时区（Excel 不支持时区）
+    for j, dtype in enumerate(df.dtypes):
+        if isinstance(dtype, pd.DatetimeTZDtype) or dtype.kind in 'mM':
+            out[h:, w + j] = _datetime_objects(df.iloc[:, j])
+    if header:
+        out[0, w:] = _axis_labels(df.columns, "Column_")
+    if index:
+        out[h:, 0] = _axis_labels(df.index, "Row_")
+        # 为 header 行的索引位置留空
+        if header: out[0, 0] = None
+    return out
+
+def _write_block_shape(df: pd.DataFrame, header: bool, index: bool) -> tuple:
+    """_build_write_block 结果的形状，无需实际构建"""
+    if df.empty:
+        return df.shape
+    return df.shape[0] + (1 if header else 0), df.shape[1] + (1 if index else 0)
+
+def _iter_write_rows(df: pd.DataFrame, header: bool, index: bool):
+    """逐行产出与 _build_write_block 相同的 Python 值列表；按块转换，峰值内存只占一个块"""
+    if df.empty:
+        return
+    for i in range(0, len(df), _STREAM_CHUNK_ROWS):
+        block = _build_write_block(df.iloc[i:i + _STREAM_CHUNK_ROWS], header and i == 0, index)
+        for row in block:
+            yield row.tolist()
+
+def _datetime_objects(col: pd.Series) -> np.ndarray:
+    """datetime64/timedelta64 列转为 datetime.datetime/timedelta 对象数组（精度到微秒），缺失值保持为 NaT"""
+    if isinstance(col.dtype, pd.DatetimeTZDtype):
+        col = col.dt.tz_localize(None)
+    arr = col.to_numpy()
+    unit = 'datetime64[us]' if arr.dtype.kind == 'M' else 'timedelta64[us]'
+    out = arr.astype(unit).astype(object)
+    out[np.isnat(arr)] = pd.NaT
+    return out
+
+def _axis_labels(labels: pd.Index, prefix: str) -> np.ndarray:
+    """行/列标签转为一维 object 数组：默认 RangeIndex 加前缀，其余保持原值（多级标签为元组）"""
+    if isinstance(labels, pd.RangeIndex):
+        return (prefix + labels.astype(str)).to_numpy(dtype=object)
+    return labels.astype(object).to_numpy()
+
+def _write_block(ws, data_to_write: np.ndarray, start_row: int, start_col: int) -> None:
+    """把二维数据写入工作表，语义与逐格 ws.cell(row, column, value) 相同（None 不覆盖已有值）
+
+    逐行 tolist() 取出 Python 原生值，不一次性物化整块的嵌套列表。
+    """
+    if start_col == 1 and start_row == ws._current_row + 1 and data_to_write.size:
+        # 从第 1 列紧接已用区域之后写入：目标区域必然为空，整行 append
+        for row in data_to_write:
+            ws.append(row.tolist())
+        return
+    # 直接读写单元格字典，省去 ws.cell 的逐格参数校验与查找开销
+    cells = ws._cells
     for i, row in enumerate(data_to_write):
         r = start_row + i
-        for j, val in enumerate(row):
-            cell_set(row=r, column=start_col + j, value=val)
+        for j, val in enumerate(row.tolist()):
+            key = (r, start_col + j)
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = Cell(ws, row=r, column=start_col + j, value=val)
+            elif val is not None:
+                cell.value = val
+    if len(data_to_write):
+        ws._current_row = max(ws._current_row, start_row + len(data_to_write) - 1)
+
+def _append_block(ws, rows, start_row: int, start_col: int, n_rows: int) -> None:
+    """向 write_only 工作表追加 n_rows 行：先补空行到 start_row，列偏移用 None 补齐（已写行数记在 ws._max_row）"""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    for _ in range(start_row - 1 - ws._max_row):
+        ws.append([])
+    pad = [None] * (start_col - 1)
+    ws.append(pad + first)
+    for row in rows:
+        ws.append(pad + row)
+    ws._max_row = start_row + n_rows - 1
+
+# 可参与合并的任务参数（end_row/end_col/overwrite 在写入时不生效，可忽略）
+_COALESCE_KEYS = {'df', 'sheet_name', 'start_row', 'start_col', 'header', 'index', 'merge_policy',
+                  'end_row', 'end_col', 'overwrite'}
+
+def _coalesce_tasks(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """把同一工作表上首尾相接的连续任务合并为一次写入，结果与逐个写入相同
+
+    后续任务须不写表头、与前一任务同表同起始列、列数一致且紧接其末行；
+    只合并 merge_policy='unmerge' 的任务（不会中途报错），任务顺序保持不变。
+    相邻判断只用写入块的形状，只有连续 2 个及以上的任务才真正构建写入块。
+    """
+    out: List[Dict[str, Any]] = []
+    run: List[tuple] = []  # [(task, (rows, cols))]
+
+    def flush():
+        if len(run) == 1:
+            out.append(run[0][0])
+        elif run:
+            first = run[0][0]
+            blocks = [_build_write_block(task['df'], task.get('header', True), task.get('index', False))
+                      for task, _ in run]
+            out.append({
+                'df': pd.DataFrame(np.vstack(blocks)),
+                'sheet_name': first.get('sheet_name', 0),
+                'start_row': first.get('start_row', 1),
+                'start_col': first.get('start_col', 1),
+                'header': False,
+                'index': False,
+            })
+        run.clear()
 
-    if _workbook is None and _save: wb.save(excel_name)
+    for task in tasks:
+        shape = _coalescible_shape(task)
+        if shape is None:
+            flush()
+            out.append(task)
+            continue
+        if run:
+            prev, prev_shape = run[-1]
+            sheet, prev_sheet = task.get('sheet_name', 0), prev.get('sheet_name', 0)
+            if not (type(sheet) is type(prev_sheet) and sheet == prev_sheet
+                    and not task.get('header', True)
+                    and task.get('start_col', 1) == prev.get('start_col', 1)
+                    and shape[1] == prev_shape[1]
+                    and task.get('start_row', 1) == prev.get('start_row', 1) + prev_shape[0]):
+                flush()
+        run.append((task, shape))
+    flush()
+    return out
+
+def _coalescible_shape(task: Dict[str, Any]) -> Optional[tuple]:
+    """任务可参与合并时返回其写入块的形状（不构建写入块），否则返回 None"""
+    df = task.get('df')
+    if not isinstance(df, pd.DataFrame) or df.empty or not set(task) <= _COALESCE_KEYS:
+        return None
+    if task.get('merge_policy', 'unmerge') != 'unmerge':
+        return None
+    start_row, start_col = task.get('start_row', 1), task.get('start_col', 1)
+    if not (isinstance(start_row, int) and isinstance(start_col, int) and start_row >= 1 and start_col >= 1):
+        return None
+    return _write_block_shape(df, task.get('header', True), task.get('index', False))
+
+def _is_append_only(tasks: List[Dict[str, Any]]) -> bool:
+    """按 _get_or_create_worksheet 的规则解析各任务的工作表，判断每张表上的写入是否行号严格递增、互不回写"""
+    names: List[str] = []
+    last_row: Dict[str, int] = {}
+    for task in tasks:
+        df = task.get('df')
+        sheet_name = task.get('sheet_name', 0)
+        start_row = task.get('start_row', 1)
+        if not isinstance(df, pd.DataFrame) or not isinstance(start_row, int) or start_row < 1:
+            return False  # 交给常规路径给出参数错误
+        if isinstance(sheet_name, int):
+            if sheet_name < 0:
+                return False
+            if sheet_name < len(names):
+                name = names[sheet_name]
+            else:
+                name = f"Sheet{sheet_name + 1}"
+                if name in names:
+                    return False  # 重名时 openpyxl 会改名，不做推断
+                names.append(name)
+        else:
+            name = sheet_name
+            if name not in names:
+                names.append(name)
+        if df.empty:
+            continue
+        if start_row <= last_row.get(name, 0):
+            return False
+        last_row[name] = start_row + len(df) + (1 if task.get('header', True) else 0) - 1
+    return True
+
+def _write_new_xlsxwriter(excel_name: str, sheet_name: Union[str, int], rows,
+                          start_row: int, start_col: int) -> None:
+    """用 xlsxwriter（constant_memory 模式）新建文件并按行写出 rows（逐行的值列表），单元格内容与 openpyxl 写入一致"""
+    # 与 _get_or_create_worksheet 在空工作簿上的命名一致
+    title = f"Sheet{sheet_name + 1}" if isinstance(sheet_name, int) else sheet_name
+    with xlsxwriter.Workbook(excel_name, _XLSXWRITER_OPTIONS) as wb:
+        ws = wb.add_worksheet(title)
+        date_formats = {t: wb.add_format({'num_format': TIME_FORMATS[t]}) for t in _DATE_TYPES}
+        write_number = ws.write_number
+        for i, row in enumerate(rows):
+            r = start_row - 1 + i
+            for j, val in enumerate(row):
+                c = start_col - 1 + j
+                t = type(val)
+                if t is float or t is int:
+                    # 最常见的数值直接写，跳过 write() 的类型分派；NaN 与 ±inf 不满足该比较，留空
+                    if -_INF < val < _INF:
+                        write_number(r, c, val)
+                    continue
+                if val is None or (isinstance(val, float) and not -_INF < val < _INF):
+                    continue
+                if val is pd.NaT:
+                    # openpyxl 将 NaT 写为带日期时间格式的空单元格
+                    ws.write_blank(r, c, None, date_formats[datetime.datetime])
+                elif isinstance(val, _DATE_TYPES):
+                    fmt = next(date_formats[dt] for dt in _DATE_TYPES if isinstance(val, dt))
+                    ws.write_datetime(r, c, val, fmt)
+                else:
+                    ws.write(r, c, val)
 
 def _handle_merged_cells(ws: openpyxl.worksheet.worksheet.Worksheet, start_row: int, end_row: int, start_col: int, end_col: int, policy: MergePolicy):
     """根据策略处理与写入区域重叠的合并单元格。"""
     if not (hasattr(ws, 'merged_cells') and ws.merged_cells.ranges):
         return
 
-    # 必须复制，因为 unmerge_cells 会修改原始集合
-    merged_ranges = list(ws.merged_cells.ranges)
-
-    overlapping_ranges = []
-    for m_range in merged_ranges:
-        if not (m_range.max_row < start_row or m_range.min_row > end_row or
-                m_range.max_col < start_col or m_range.min_col > end_col):
-            overlapping_ranges.append(m_range)
+    overlapping_ranges = _overlapping_merges(ws, start_row, end_row, start_col, end_col)
 
     if not overlapping_ranges: return
 
@@ -174,12 +477,105 @@ def _handle_merged_cells(ws: openpyxl.worksheet.worksheet.Worksheet, start_row:
         raise ValueError(f"写入区域与合并单元格 {overlapping_ranges[0]} 存在冲突。请更改写入位置或使用 merge_policy='unmerge'。")
     
     if policy == 'unmerge':
+        # 等价于 ws.unmerge_cells，但直接移除已知的区域对象：省去坐标字符串解析和对全部合并区域的包含性扫描
+        merged, cells = ws.merged_cells, ws._cells
         for m_range in overlapping_ranges:
-            # unmerge_cells 可能会在某些 openpyxl 版本中对已移除的 range 抛出 KeyError
             try:
-                ws.unmerge_cells(str(m_range))
-            except KeyError:
-                pass
+                merged.remove(m_range)
+            except (KeyError, ValueError):
+                continue
+            # 保留左上角单元格，删除其余 MergedCell 占位
+            coords = m_range.cells
+            next(coords)
+            for coord in coords:
+                cells.pop(coord, None)
+        _merge_index.pop(ws, None)
+
+def _overlapping_merges(ws, start_row: int, end_row: int, start_col: int, end_col: int) -> list:
+    """查找与写入区域重叠的合并单元格
+
+    按起始行排序的边界数组在首次访问工作表时建立并缓存：起始行不超过 end_row、
+    且不早于 start_row 减去最大跨行数的区间才可能重叠，二分定位后对这一段做向量化判断。
+    写入区域落在全部合并单元格的外包矩形之外时直接返回。
+    缓存以全部合并区域的边界为键：调用方合并、取消合并或移动了任一区域（即使数量不变）都会重建。
+    """
+    ranges = ws.merged_cells.ranges
+    key = tuple(m.bounds for m in ranges)
+    entry = _merge_index.get(ws)
+    if entry is None or entry[0] != key:
+        ordered = sorted(ranges, key=attrgetter('min_row'))
+        bounds = np.array([(m.min_row, m.max_row, m.min_col, m.max_col) for m in ordered],
+                          dtype=np.int64).reshape(-1, 4)
+        span = int((bounds[:, 1] - bounds[:, 0]).max()) if len(ordered) else 0
+        # 外包矩形 (min_row, max_row, min_col, max_col)
+        box = (int(bounds[:, 0].min()), int(bounds[:, 1].max()), int(bounds[:, 2].min()),
+               int(bounds[:, 3].max())) if len(ordered) else (1, 0, 1, 0)
+        entry = _merge_index[ws] = (key, bounds, ordered, span, box)
+    _, bounds, ordered, span, box = entry
+    if end_row < box[0] or start_row > box[1] or end_col < box[2] or start_col > box[3]:
+        return []
+    lo = int(np.searchsorted(bounds[:, 0], start_row - span, side='left'))
+    hi = int(np.searchsorted(bounds[:, 0], end_row, side='right'))
+    window = bounds[lo:hi]
+    hits = np.flatnonzero((window[:, 1] >= start_row) & (window[:, 3] >= start_col) & (window[:, 2] <= end_col))
+    return [ordered[lo + i] for i in hits.tolist()]
+
+def _check_writable_format(excel_name: str) -> None:
+    """openpyxl/xlsxwriter 只能写出 xlsx 格式；.xlsb/.xls 会得到扩展名与内容不符、Excel 无法打开的文件"""
+    ext = os.path.splitext(excel_name)[1].lower()
+    if ext in ('.xlsb', '.xls'):
+        raise ValueError(f"不支持写入 {ext} 格式，请使用 .xlsx 或 .xlsm 文件")
+
+def _file_stamp(path: str) -> tuple:
+    st = os.stat(path)
+    # inode 变化说明文件已被替换（如其他程序另存覆盖），即使修改时间与大小相同
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+def _take_cached_workbook(excel_name: str, reuse: bool) -> openpyxl.Workbook:
+    """reuse=True 时取出缓存的工作簿（文件自上次保存后未变化时），否则重新加载；取出即移出缓存，写入失败时不会残留半成品"""
+    path = os.path.abspath(excel_name)
+    hit = _workbook_cache.pop(path, None)
+    if hit is not None and reuse:
+        try:
+            if hit[0] == _file_stamp(path):
+                return hit[1]
+        except OSError:
+            pass
+    return _open_or_create_workbook(excel_name)
+
+def _save_and_cache(wb: openpyxl.Workbook, excel_name: str, cache: bool) -> None:
+    """保存工作簿；cache=True 时以保存后的文件标识缓存，供下一次写入同一文件时复用（含图片/图表时不缓存）"""
+    _atomic_save(wb.save, excel_name)
+    if not cache or any(getattr(ws, '_images', None) or getattr(ws, '_charts', None) for ws in wb.worksheets):
+        return
+    path = os.path.abspath(excel_name)
+    if len(_workbook_cache) >= _WORKBOOK_CACHE_SIZE:
+        _workbook_cache.pop(next(iter(_workbook_cache)))
+    _workbook_cache[path] = (_file_stamp(path), wb)
+
+def _atomic_save(save, excel_name: str) -> None:
+    """save(path) 先写出同目录下的临时文件，成功后再替换目标文件：保存中途出错不会留下损坏或半写的目标文件
+
+    临时文件名唯一，多个进程同时保存同一文件时互不覆盖；替换后保留原文件的权限，新文件使用 umask 默认权限。
+    目标为符号链接时替换其指向的文件，链接本身保持不变。
+    """
+    target = os.path.realpath(excel_name)
+    directory = os.path.dirname(target)
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=os.path.basename(target) + '.',
+                                     suffix='.tmp', delete=False) as f:
+        tmp = f.name
+    try:
+        # openpyxl / xlsxwriter 按路径保存，临时文件先关闭再交给 save
+        save(tmp)
+        if os.path.exists(target):
+            shutil.copymode(target, tmp)
+        else:
+            os.chmod(tmp, _NEW_FILE_MODE)
+        os.replace(tmp, target)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
 
 def _open_or_create_workbook(excel_name: str) -> openpyxl.Workbook:
     try: return openpyxl.load_workbook(excel_name, data_only=False, read_only=False)